@@ -129,7 +129,7 @@ class Config:
     # Настройки парсинга
     PARSING = {
         'max_parkings': None,  # None - без ограничения
-        'coord_tolerance': 0.001,  # Допуск по координатам
+        'coord_tolerance_m': 100,  # Допуск по координатам (метры)
         'name_similarity': 0.7,  # Порог схожести названий
         'delay_min': 2,  # Минимальная задержка между запросами (сек)
         'delay_max': 4,  # Максимальная задержка между запросами (сек)
@@ -139,12 +139,142 @@ class Config:
         'max_consecutive_no_new': 3,  # Максимально попыток без новых данных
     }
 
+    # Настройки обхода страниц объектов
+    CRAWL = {
+        'concurrency': 3,  # Количество вкладок браузера для параллельного парсинга объектов
+        'pipeline': True,  # Парсить объекты параллельно со сбором URL по зонам
+        'journal_dir': 'results/journal',  # Каталог журналов обхода (для --resume)
+        'shard_dir': 'results/shards',  # Каталог результатов процессов-шардов (--shards)
+        'record_ttl_hours': None,  # Не перезагружать объекты, распарсенные за последние N часов (None - всегда)
+        'capture_search_responses': True,  # Брать выдачу поиска из JSON-ответов сайта, а не из DOM
+        'autotune': True,  # Подбирать частоту запросов и число вкладок по доле ошибок (AIMD)
+        'max_concurrency': 6,  # Максимум вкладок при автонастройке
+        'autotune_window': 20,  # Страниц в окне, после которого принимается решение
+        'autotune_rate_step': 0.05,  # Прирост частоты запросов за хорошее окно (запросов/сек)
+        'autotune_min_rate': 0.05,  # Минимальная частота запросов
+        'autotune_max_rate': 1.0,  # Максимальная частота запросов
+        'autotune_decrease_above': 0.2,  # Доля пустых страниц/ошибок, при которой темп снижается вдвое
+        'autotune_increase_below': 0.05,  # Доля пустых страниц/ошибок, при которой темп повышается
+        'ready_timeout': 15,  # Максимальное ожидание готовности страницы (сек)
+        'ready_poll_interval': 0.25,  # Период проверки готовности (сек)
+        'ready_settle': 0.3,  # Пауза после появления содержимого (сек)
+        'harvest_links_in_page': True,  # Копить ссылки выдачи наблюдателем DOM, а не разбирать весь outerHTML
+    }
+
+    # Управление браузером (память Chrome растет за тысячи переходов)
+    BROWSER = {
+        'max_pages': 1000,  # Перезапускать браузер после N переходов (None - не перезапускать)
+        'max_rss_mb': 2048,  # Перезапускать браузер, если он занимает больше M МБ (нужен psutil)
+        'rss_check_every': 10,  # Проверять память каждые N переходов
+        'tab_max_pages': 100,  # Заменять вкладку воркера новой после N страниц
+    }
+
+    # Предельное время операций браузера (сек), чтобы зависшая страница не останавливала обход
+    TIMEOUTS = {
+        'launch': 60,  # Запуск браузера
+        'navigation': 45,  # Переход по URL
+        'content': 20,  # Получение HTML страницы
+        'evaluate': 15,  # Выполнение скрипта, клик, поиск элемента
+        'page': 120,  # Страница объекта целиком (переход, ожидание, извлечение)
+        'zone': 900,  # Сбор ссылок одной зоны целиком
+        'requeue_max': 2,  # Сколько раз возвращать URL в очередь после таймаута
+        'requeue_backoff': 30,  # Пауза перед первым повтором (удваивается)
+    }
+
+    # Дублирующие запросы для страниц объектов, загружающихся дольше обычного
+    HEDGING = {
+        'enabled': False,  # Дублировать медленные страницы в запасной вкладке
+        'percentile': 95,  # Порог: перцентиль времени загрузки страниц
+        'min_delay': 5,  # Не дублировать раньше чем через N сек
+        'min_samples': 20,  # Сколько загрузок нужно для оценки порога
+        'window': 200,  # По скольким последним загрузкам считается порог
+        'spare_tabs': 1,  # Запасных вкладок
+    }
+
+    # Ограничение частоты переходов по страницам (общее для всех вкладок и этапов)
+    RATE_LIMIT = {
+        'hosts': {  # Запросов в секунду и запас для коротких всплесков
+            'yandex.ru': {'rate': 0.35, 'burst': 2},
+            '2gis.ru': {'rate': 0.3, 'burst': 2},
+        },
+        'default_rate': None,  # Остальные хосты (None - по delay_min/delay_max из PARSING)
+        'default_burst': 1,
+    }
+
+    # Разбиение города на зоны поиска
+    ZONES = {
+        'planner': 'quadtree',  # 'quadtree' - адаптивное деление, 'grid' - фиксированная сетка z=14
+        'start_zoom': 12,  # Масштаб начальной (крупной) сетки
+        'max_zoom': 16,  # Максимальный масштаб при делении зон
+        'state_dir': 'results/zones',  # Каталог выученного разбиения
+        'empty_recheck_days': 30,  # Через сколько дней перепроверять пустые зоны
+    }
+
+    # Кэш HTML страниц объектов
+    HTML_CACHE = {
+        'enabled': True,  # Сохранять загруженные страницы объектов
+        'cache_dir': 'results/html_cache',  # Каталог кэша
+        'max_size_mb': 2048,  # Максимальный размер сжатых страниц (старые вытесняются)
+        'max_age_hours': None,  # Брать страницы из кэша не старше N часов (None - всегда загружать)
+    }
+
+    # Блокировка ненужных ресурсов в браузере (нужен только DOM)
+    RESOURCE_BLOCKING = {
+        'enabled': True,  # False - загружать все (например, если понадобятся фото)
+        'resource_types': ['Image', 'Media', 'Font'],  # Типы ресурсов CDP
+        'url_patterns': [  # Счетчики и аналитика
+            '*://mc.yandex.ru/*',
+            '*://an.yandex.ru/*',
+            '*://yandex.ru/clck/*',
+            '*google-analytics.com/*',
+            '*googletagmanager.com/*',
+            '*://top-fwz1.mail.ru/*',
+        ],
+        'avg_bytes': {  # Средний размер ресурса для оценки сэкономленного трафика
+            'Image': 25 * 1024,
+            'Media': 500 * 1024,
+            'Font': 40 * 1024,
+            'Other': 10 * 1024,
+        },
+    }
+
     # Настройки для 2ГИС парсера
     TWOGIS = {
         'base_url': 'https://2gis.ru',
         'search_query': 'парковки',
         'max_pages': 50,  # Максимальное количество страниц для парсинга
         'items_per_page': 50,  # Количество элементов на странице
+        'search_api_patterns': [r'catalog\.api\.2gis\.(?:ru|com)/[\d.]+/items'],  # XHR поисковой выдачи
+        'zone_saturation': 100,  # Объектов в выдаче зоны, при котором зона делится на 4
+        'result_link_pattern': r'/firm/\d+',  # href карточек выдачи (для наблюдателя DOM)
+        'ready_selectors': {  # Признаки загруженного содержимого страниц
+            'detail': ['h1', '[itemprop="address"]', 'address', '.firm-card__title'],
+            'zone': ['.minicard', 'a[href*="/firm/"]', '.searchResults__list'],
+        },
+        'fields': [  # Поля карточки объекта: селекторы по приоритету, проверки и обработка (FieldSpec)
+            {'field': 'Название объекта', 'separator': ' ', 'strip': True, 'min_length': 3,
+             'selectors': ['h1', '[itemprop="name"]', '.firm-card__title', '.business-card-title',
+                           'h1[data-qa="firm-card-header-name"]']},
+            {'field': 'Адрес', 'separator': ' ', 'strip': True, 'min_length': 6,
+             'selectors': ['address', '[itemprop="address"]', '.address', '.firm-card__address',
+                           '[data-qa="firm-card-address"]']},
+            # Сайт: приоритет у специальных элементов, затем https-ссылки, затем http
+            {'field': 'Сайт', 'attr': 'href', 'all_matches': True, 'exclude': ['2gis.ru'],
+             'selectors': ['[data-qa="website"]', '.website', '.contact__website',
+                           'a[href^="https://"]:not([href*="2gis.ru"])', 'a[href^="http://"]:not([href*="2gis.ru"])']},
+            {'field': 'Тип объекта', 'strip': True,
+             'selectors': ['[itemprop="category"]', '.category', '.firm-card__category', '.business-card-category']},
+            {'field': 'Время работы', 'separator': ' ', 'strip': True, 'contains_any': [':', 'час', 'открыт'],
+             'selectors': ['[itemprop="openingHours"]', '.working-hours', '.schedule', '.hours',
+                           '[data-qa="opening-hours"]']},
+            {'field': 'Оценка', 'strip': True, 'pattern': r'[\d.]+',
+             'selectors': ['[itemprop="ratingValue"]', '.rating', '.business-rating-badge', '[data-qa="rating"]']},
+            {'field': 'Количество оценок', 'strip': True, 'pattern': r'\d+',
+             'selectors': ['[itemprop="reviewCount"]', '.reviews-count', '.review-count', '[data-qa="reviews-count"]']},
+            {'field': 'Описание', 'separator': ' ', 'strip': True, 'min_length': 21, 'max_length': 200,
+             'selectors': ['.firm-card__description', '[itemprop="description"]', '.description',
+                           '.firm-description']},
+        ],
     }
 
     # Настройки для Яндекс парсера
@@ -153,6 +283,39 @@ class Config:
         'search_query': 'парковки',
         'city': 'saint-petersburg',
         'region_code': '2',  # 2 для Санкт-Петербурга
+        'search_api_patterns': [r'/maps/api/search'],  # XHR поисковой выдачи
+        'zone_saturation': 100,  # Объектов в выдаче зоны, при котором зона делится на 4
+        'result_link_pattern': r'/maps/org/',  # href карточек выдачи (для наблюдателя DOM)
+        'ready_selectors': {  # Признаки загруженного содержимого страниц
+            'detail': ['.orgpage-header-view__header', '.business-contacts-view__address', 'h1'],
+            'zone': ['.search-snippet-view', 'span.search-command-view__show-results-button'],
+            'results': ['.search-snippet-view', '.search-list-view__list'],
+        },
+        'fields': [  # Поля карточки объекта: селекторы по приоритету, проверки и обработка (FieldSpec)
+            {'field': 'Название объекта', 'copy_to': ['Название парковки'],
+             'selectors': ['h1', '.orgpage-header-view__header', '.business-title', '.card-title-view__title',
+                           '[itemprop="name"]']},
+            {'field': 'Адрес', 'copy_to': ['Адрес парковки'],
+             'selectors': ['[itemprop="address"]', '.business-contacts-view__address', '.card-address-view__address',
+                           '.orgpage-address-view__address-text', 'address']},
+            {'field': 'Сайт', 'attr': 'href', 'exclude': ['yandex.ru'],
+             'selectors': ['.business-urls-view__link', '.card-website-view__link', '.orgpage-url-view__url']},
+            {'field': 'Тип объекта',
+             'selectors': ['.business-categories-view__category', '.card-categories-view__category',
+                           '.orgpage-categories-view__category', '[itemprop="category"]']},
+            {'field': 'Время работы', 'contains_any': [':', 'час'],
+             'selectors': ['.business-feature-view__schedule-days', '.card-schedule-view__schedule',
+                           '.orgpage-working-view__working-days', '[itemprop="openingHours"]']},
+            {'field': 'Оценка',
+             'selectors': ['.business-rating-badge-view__rating-text', '.card-rating-view__rating',
+                           '.orgpage-rating-view__rating', '[itemprop="ratingValue"]']},
+            {'field': 'Количество оценок',
+             'selectors': ['.business-rating-badge-view__rating-count', '.card-rating-view__reviews-count',
+                           '.orgpage-reviews-view__reviews-count', '[itemprop="reviewCount"]']},
+            {'field': 'Описание', 'max_length': 500,
+             'selectors': ['.business-description-view__description', '.card-description-view__description',
+                           '.orgpage-description-view__description', '[itemprop="description"]']},
+        ],
     }
 
 
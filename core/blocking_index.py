@@ -0,0 +1,24 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+
+class BlockingIndex:
+    """
+    Обратный индекс ключей блокировки (последние цифры телефона, улица с номером дома):
+    кандидаты для записи - записи, у которых есть хотя бы один общий с ней ключ.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+    def add(self, key_id: int, keys: Iterable[str]):
+        """Добавление записи key_id с ее ключами"""
+        for key in keys:
+            self.postings[key].append(key_id)
+
+    def candidates(self, keys: Iterable[str]) -> Set[int]:
+        """Записи, у которых есть хотя бы один из ключей"""
+        found: Set[int] = set()
+        for key in keys:
+            found.update(self.postings.get(key, ()))
+        return found
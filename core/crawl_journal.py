@@ -0,0 +1,120 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Set, Iterable
+
+
+def journal_path(journal_dir: str, source: str) -> Path:
+    """Файл журнала источника (один на источник, общий для процессов-шардов)"""
+    return Path(journal_dir) / f"{source}.sqlite"
+
+
+class CrawlJournal:
+    """Журнал обхода на диске (SQLite): пройденные зоны, найденные URL и извлеченные записи"""
+
+    def __init__(self, path: str):
+        """
+        Открытие (или создание) журнала
+
+        Args:
+            path: Путь к файлу журнала
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Журнал источника общий для процессов-шардов: запись ждет освобождения блокировки
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        # WAL переживает аварийное завершение без потери закоммиченных записей
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        """Создание таблиц журнала"""
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS zones ("
+                "zone_key TEXT PRIMARY KEY, urls_found INTEGER, done_at REAL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, discovered_at REAL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "item_id TEXT PRIMARY KEY, url TEXT, data TEXT, parsed_at REAL)"
+            )
+
+    def start_run(self, resume: bool = False) -> float:
+        """
+        Начало прогона
+
+        Без resume состояние прошлого прогона (зоны и URL) сбрасывается.
+        Извлеченные записи сохраняются всегда.
+
+        Returns:
+            Время начала текущего (или продолжаемого) прогона
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'run_started_at'").fetchone()
+        if resume and row:
+            return float(row[0])
+
+        started_at = time.time()
+        with self.conn:
+            self.conn.execute("DELETE FROM zones")
+            self.conn.execute("DELETE FROM urls")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('run_started_at', ?)",
+                (str(started_at),)
+            )
+        return started_at
+
+    def done_zones(self) -> Set[str]:
+        """Ключи зон, полностью пройденных в текущем прогоне"""
+        return {row[0] for row in self.conn.execute("SELECT zone_key FROM zones")}
+
+    def mark_zone_done(self, zone_key: str, urls_found: int = 0):
+        """Отметка зоны как пройденной"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO zones (zone_key, urls_found, done_at) VALUES (?, ?, ?)",
+                (zone_key, urls_found, time.time())
+            )
+
+    def add_urls(self, urls: Iterable[str]):
+        """Запись найденных URL"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, discovered_at) VALUES (?, ?)",
+                [(url, now) for url in urls]
+            )
+
+    def discovered_urls(self) -> List[str]:
+        """Все URL, найденные в текущем прогоне, в порядке обнаружения"""
+        return [row[0] for row in self.conn.execute("SELECT url FROM urls ORDER BY discovered_at")]
+
+    def save_record(self, item_id: str, url: str, data: Dict[str, Any]):
+        """Запись извлеченных данных объекта"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO records (item_id, url, data, parsed_at) VALUES (?, ?, ?, ?)",
+                (item_id, url, json.dumps(data, ensure_ascii=False), time.time())
+            )
+
+    def records_since(self, since: float) -> Dict[str, Dict[str, Any]]:
+        """Записи, извлеченные не раньше указанного времени: {item_id: данные}"""
+        rows = self.conn.execute(
+            "SELECT item_id, data FROM records WHERE parsed_at >= ?", (since,)
+        )
+        return {item_id: json.loads(data) for item_id, data in rows}
+
+    def close(self):
+        """Закрытие журнала"""
+        try:
+            self.conn.close()
+        except Exception as e:
+            print(f"⚠️ Ошибка при закрытии журнала: {e}")
@@ -0,0 +1,123 @@
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from core.rate_limiter import TokenBucket
+
+# Исходы загрузки страницы объекта
+SUCCESS = 'success'  # Данные получены с первой попытки
+RETRY = 'retry'  # Данные получены после повторной попытки
+EMPTY = 'empty'  # Страница загрузилась, но данных мало
+FAIL = 'fail'  # Ошибка загрузки
+
+
+class CrawlTuner:
+    """
+    Автонастройка темпа обхода (AIMD): по окнам из window исходов частота запросов
+    и число одновременно загружаемых страниц растут на шаг, пока ошибок мало,
+    и уменьшаются вдвое, когда растет доля пустых страниц, повторов и ошибок.
+    """
+
+    def __init__(self, concurrency: int, max_concurrency: int, enabled: bool = True, window: int = 20,
+                 rate_step: float = 0.05, min_rate: float = 0.05, max_rate: float = 1.0,
+                 decrease_above: float = 0.2, increase_below: float = 0.05):
+        """
+        Args:
+            concurrency: Начальное число страниц в работе
+            max_concurrency: Максимальное число страниц в работе
+            enabled: False - только учет исходов, без изменения настроек
+            window: Исходов в окне, после которого принимается решение
+            rate_step: Прирост частоты запросов (запросов/сек) за хорошее окно
+            min_rate: Минимальная частота запросов
+            max_rate: Максимальная частота запросов
+            decrease_above: Доля плохих исходов, при которой темп снижается вдвое
+            increase_below: Доля плохих исходов, при которой темп повышается
+        """
+        self.limit = concurrency
+        self.max_concurrency = max(concurrency, max_concurrency)
+        self.enabled = enabled
+        self.window = window
+        self.rate_step = rate_step
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.decrease_above = decrease_above
+        self.increase_below = increase_below
+
+        self.bucket: Optional[TokenBucket] = None  # Лимит хоста, частоту которого настраиваем
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+        self.outcomes: Counter = Counter()  # Исходы текущего окна
+        self.totals: Counter = Counter()
+        self.decisions = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Место для загрузки страницы (не больше limit одновременно)"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self, outcome: str):
+        """Учет исхода загрузки страницы"""
+        self.outcomes[outcome] += 1
+        self.totals[outcome] += 1
+        if sum(self.outcomes.values()) >= self.window:
+            self._adjust()
+            self.outcomes.clear()
+
+    def bad_share(self, outcomes: Counter) -> float:
+        """Доля плохих исходов (повтор считается за половину)"""
+        total = sum(outcomes.values())
+        if not total:
+            return 0.0
+        return (outcomes[EMPTY] + outcomes[FAIL] + 0.5 * outcomes[RETRY]) / total
+
+    def _adjust(self):
+        """Решение по итогам окна"""
+        if not self.enabled or self.bucket is None:
+            return
+
+        bad = self.bad_share(self.outcomes)
+        rate, limit = self.bucket.rate, self.limit
+
+        if bad > self.decrease_above:
+            new_rate = max(self.min_rate, rate / 2)
+            new_limit = max(1, limit // 2)
+            action = "⬇ снижаем"
+        elif bad <= self.increase_below:
+            new_rate = min(self.max_rate, rate + self.rate_step)
+            new_limit = min(self.max_concurrency, limit + 1)
+            action = "⬆ повышаем"
+        else:
+            return
+
+        if (new_rate, new_limit) == (rate, limit):
+            return
+
+        self.bucket.set_rate(new_rate)
+        self.limit = new_limit
+        self.decisions += 1
+        print(f"   🎛 Автонастройка: плохих {bad:.0%} ({dict(self.outcomes)}) - {action} темп: "
+              f"{rate:.2f} → {new_rate:.2f} запросов/с, страниц в работе {limit} → {new_limit}")
+
+    def print_stats(self):
+        """Вывод итогов автонастройки"""
+        total = sum(self.totals.values())
+        if not total:
+            return
+
+        print(f"\n🎛 АВТОНАСТРОЙКА ТЕМПА:")
+        print(f"   Исходы: успешно {self.totals[SUCCESS]}, после повтора {self.totals[RETRY]}, "
+              f"мало данных {self.totals[EMPTY]}, ошибок {self.totals[FAIL]} "
+              f"(плохих {self.bad_share(self.totals):.0%})")
+        if self.enabled and self.bucket is not None:
+            print(f"   Решений: {self.decisions} | Итоговый режим: {self.bucket.rate:.2f} запросов/с, "
+                  f"страниц в работе {self.limit} (можно задать в Config.RATE_LIMIT и Config.CRAWL)")
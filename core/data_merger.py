@@ -1,22 +1,76 @@
 import math
 import re
-from typing import List, Dict, Any, Tuple, Optional
-from difflib import SequenceMatcher
+from typing import List, Dict, Any, Tuple, Optional, Set
+
+import numpy as np
+
+from core.blocking_index import BlockingIndex
+from core.spatial_index import GridIndex, distance_m, distances_m, grid_cell_degrees
+
+STOP_WORDS = {'ооо', 'зао', 'оао', 'торговый', 'центр', 'тц', 'тк', 'парковка', 'стоянка'}
+# Слова адреса, не различающие улицы (для ключей блокировки)
+ADDRESS_WORDS = {'улица', 'проспект', 'переулок', 'пер', 'шоссе', 'набережная', 'наб', 'бульвар', 'бул',
+                 'площадь', 'проезд', 'дорога', 'аллея', 'тупик', 'санкт', 'петербург', 'спб', 'россия',
+                 'город', 'дом', 'корпус', 'корп', 'строение', 'стр', 'литера', 'лит', 'район', 'область',
+                 'ленинградская', 'поселок', 'посёлок'}
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_NON_DIGITS = re.compile(r'[^\d]')
+_PHONE_SEPARATORS = re.compile(r'[,;]')
+
+
+def ngrams(text: str, n: int = 3) -> Set[str]:
+    """Множество n-грамм символов текста (с пробелами по краям)"""
+    if not text:
+        return set()
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+def ngram_similarity(grams1: Set[str], grams2: Set[str]) -> float:
+    """Схожесть по n-граммам (коэффициент Дайса, 0.0-1.0)"""
+    if not grams1 or not grams2:
+        return 0.0
+    return 2 * len(grams1 & grams2) / (len(grams1) + len(grams2))
+
+
+class MatchRecord:
+    """Признаки объекта для сравнения, вычисленные один раз: координаты, нормализованные
+    название и адрес с их n-граммами, последние 7 цифр каждого телефона, ключи блокировки"""
+
+    __slots__ = ('has_coords', 'coords', 'has_name', 'name_grams', 'has_address', 'address_grams', 'phones',
+                 'blocking_keys')
+
+    def __init__(self, has_coords: bool, coords: Optional[Tuple[float, float]], has_name: bool, name: str,
+                 has_address: bool, address: str, phones: Set[str], address_keys: Set[str]):
+        self.has_coords = has_coords  # Координаты указаны (даже если не разобрались)
+        self.coords = coords
+        self.has_name = has_name  # Поле заполнено (после нормализации может остаться пустым)
+        self.name_grams = ngrams(name)
+        self.has_address = has_address
+        self.address_grams = ngrams(address)
+        self.phones = phones
+        # Ключи для поиска кандидатов без координат: телефоны и улица с номером дома
+        self.blocking_keys = {f"tel:{phone}" for phone in phones} | {f"addr:{key}" for key in address_keys}
 
 
 class DataMerger:
     """Класс для объединения данных из разных источников"""
 
-    def __init__(self, coord_tolerance: float = 0.001, name_similarity: float = 0.7):
+    def __init__(self, coord_tolerance_m: float = 100.0, name_similarity: float = 0.7,
+                 exact_assignment_edges: int = 12):
         """
         Инициализация мерджера
 
         Args:
-            coord_tolerance: Допуск по координатам в градусах
+            coord_tolerance_m: Допуск по координатам в метрах (оценка координат падает до нуля
+                к удвоенному допуску)
             name_similarity: Порог схожести названий (0.0-1.0)
+            exact_assignment_edges: Группы спорных пар не больше этого размера назначаются точно
+                (максимум суммы оценок), большие - жадно (0 - всегда жадно)
         """
-        self.coord_tolerance = coord_tolerance
+        self.coord_tolerance_m = coord_tolerance_m
         self.name_similarity = name_similarity
+        self.exact_assignment_edges = exact_assignment_edges
 
     def parse_coordinates(self, coord_str: str) -> Optional[Tuple[float, float]]:
         """Парсинг строки с координатами в числа"""
@@ -61,13 +115,7 @@ class DataMerger:
         if not parsed1 or not parsed2:
             return False
 
-        lat1, lon1 = parsed1
-        lat2, lon2 = parsed2
-
-        lat_diff = abs(lat1 - lat2)
-        lon_diff = abs(lon1 - lon2)
-
-        return lat_diff <= self.coord_tolerance and lon_diff <= self.coord_tolerance
+        return distance_m(*parsed1, *parsed2) <= self.coord_tolerance_m
 
     def normalize_text(self, text: Any) -> str:
         """Нормализация текста для сравнения"""
@@ -82,25 +130,58 @@ class DataMerger:
         text = text.lower()
 
         # Убираем лишние символы и слова
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
+        text = _PUNCTUATION.sub(' ', text)
 
         # Убираем стоп-слова
-        stop_words = {'ооо', 'зао', 'оао', 'торговый', 'центр', 'тц', 'тк', 'парковка', 'стоянка'}
-        words = text.split()
-        words = [w for w in words if w not in stop_words]
+        words = [w for w in text.split() if w not in STOP_WORDS]
 
-        return ' '.join(words).strip()
+        return ' '.join(words)
 
     def text_similarity(self, text1: Any, text2: Any) -> float:
-        """Вычисление схожести текстов"""
-        norm1 = self.normalize_text(text1)
-        norm2 = self.normalize_text(text2)
-
-        if not norm1 or not norm2:
-            return 0.0
-
-        return SequenceMatcher(None, norm1, norm2).ratio()
+        """Вычисление схожести текстов (по n-граммам символов)"""
+        return ngram_similarity(ngrams(self.normalize_text(text1)), ngrams(self.normalize_text(text2)))
+
+    def phone_keys(self, phone: Any) -> Set[str]:
+        """Последние 7 цифр каждого номера из строки телефонов"""
+        if not phone:
+            return set()
+        keys = set()
+        for part in _PHONE_SEPARATORS.split(str(phone)):
+            digits = _NON_DIGITS.sub('', part)
+            if digits:
+                keys.add(digits[-7:])
+        return keys
+
+    def address_keys(self, address: str) -> Set[str]:
+        """Ключи адреса: слово названия улицы с номером дома ('невский 28'); без номера - только слова"""
+        words, numbers = [], []
+        for token in address.split():
+            if token.isdigit() and len(token) <= 4:
+                numbers.append(token)
+            elif token.isalpha() and len(token) >= 3 and token not in ADDRESS_WORDS:
+                words.append(token)
+
+        if not numbers:
+            return set(words)
+        return {f"{word} {number}" for word in words for number in numbers}
+
+    def match_record(self, obj: Dict[str, Any]) -> MatchRecord:
+        """Признаки объекта для сравнения (вычисляются один раз на объект)"""
+        coord = obj.get('Координаты', '')
+        name = obj.get('Название объекта', '')
+        address = obj.get('Адрес', '')
+        has_coords = bool(coord) and str(coord).lower() not in ['nan', 'none', 'null']
+        address = self.normalize_text(address) if address else ''
+        return MatchRecord(
+            has_coords=has_coords,
+            coords=self.parse_coordinates(coord) if has_coords else None,
+            has_name=bool(name),
+            name=self.normalize_text(name) if name else '',
+            has_address=bool(obj.get('Адрес', '')),
+            address=address,
+            phones=self.phone_keys(obj.get('Телефон', '')),
+            address_keys=self.address_keys(address),
+        )
 
     def address_match(self, addr1: Any, addr2: Any) -> bool:
         """Проверка совпадения адресов"""
@@ -360,100 +441,212 @@ class DataMerger:
 
     def find_matches(self, yandex_data: List[Dict], twogis_data: List[Dict]) -> List[Tuple[int, int, float]]:
         """
-        Поиск совпадений между данными
+        Поиск совпадений между данными: каждый объект входит не больше чем в одну пару
+
+        Returns:
+            Список кортежей (индекс_яндекс, индекс_2гис, уверенность) по возрастанию индекса Яндекс
+        """
+        edges = self.find_candidate_edges(yandex_data, twogis_data)
+        matches = self.assign_matches(edges)
+        print(f"Пар-кандидатов: {len(edges)}, назначено один к одному: {len(matches)}")
+        return matches
+
+    def find_candidate_edges(self, yandex_data: List[Dict], twogis_data: List[Dict]) -> List[Tuple[int, int, float]]:
+        """
+        Все пары объектов с оценкой не ниже порога совпадения
+
+        Объект с координатами сравнивается с объектами 2ГИС в соседних ячейках сетки
+        (размер ячейки - удвоенный допуск в метрах). Пары, где координат нет хотя бы у одного
+        объекта, сравниваются, только если у объектов есть общий ключ блокировки: последние
+        7 цифр телефона или улица с номером дома. Объект без ключей сравнивается со всеми.
 
         Returns:
             Список кортежей (индекс_яндекс, индекс_2гис, уверенность)
         """
-        matches = []
+        edges = []
+
+        yandex_records = [self.match_record(obj) for obj in yandex_data]
+        twogis_records = [self.match_record(obj) for obj in twogis_data]
+
+        # Сетка по объектам 2ГИС; ячейка не меньше радиуса, на котором оценка координат обнуляется
+        search_radius_m = 2 * self.coord_tolerance_m
+        latitudes = [abs(record.coords[0]) for record in yandex_records + twogis_records if record.coords]
+        index = GridIndex(*grid_cell_degrees(search_radius_m, max(latitudes, default=0.0)))
+        twogis_without_coords = []
+        for j, record in enumerate(twogis_records):
+            if record.coords:
+                index.add(j, *record.coords)
+            else:
+                twogis_without_coords.append(j)
+
+        # Ключи блокировки: по всем объектам 2ГИС и отдельно по объектам без координат
+        blocking_all = BlockingIndex()
+        blocking_without_coords = BlockingIndex()
+        for j, record in enumerate(twogis_records):
+            blocking_all.add(j, record.blocking_keys)
+            if not record.coords:
+                blocking_without_coords.add(j, record.blocking_keys)
+
+        # Расстояния всех пар-соседей по сетке считаются одним вызовом NumPy
+        pairs_i, pairs_j = [], []
+        for i, y_record in enumerate(yandex_records):
+            if y_record.coords:
+                nearby = index.nearby(*y_record.coords)
+                pairs_i.extend([i] * len(nearby))
+                pairs_j.extend(nearby)
+
+        nearby_scores: Dict[int, List[Tuple[int, Optional[float]]]] = {}
+        if pairs_i:
+            y_coords = np.array([yandex_records[i].coords for i in pairs_i])
+            t_coords = np.array([twogis_records[j].coords for j in pairs_j])
+            scores = self.distance_score(distances_m(y_coords[:, 0], y_coords[:, 1], t_coords[:, 0], t_coords[:, 1]))
+            for i, j, score in zip(pairs_i, pairs_j, scores.tolist()):
+                nearby_scores.setdefault(i, []).append((j, score))
+
+        all_twogis = list(range(len(twogis_data)))
+        compared = 0
+
+        for i, y_record in enumerate(yandex_records):
+            if y_record.coords:
+                if y_record.blocking_keys:
+                    without_coords = blocking_without_coords.candidates(y_record.blocking_keys)
+                else:
+                    without_coords = twogis_without_coords
+                candidates = sorted(nearby_scores.get(i, []) + [(j, None) for j in without_coords])
+            elif y_record.blocking_keys:
+                # Без координат - только объекты с общим телефоном или адресом
+                candidates = [(j, None) for j in sorted(blocking_all.candidates(y_record.blocking_keys))]
+            else:
+                candidates = [(j, None) for j in all_twogis]
 
-        for i, y_obj in enumerate(yandex_data):
-            best_match = None
-            best_score = 0
+            for j, coord_score in candidates:
+                score = self.score_records(y_record, twogis_records[j], coord_score)
+                compared += 1
 
-            for j, t_obj in enumerate(twogis_data):
-                score = self.calculate_match_score(y_obj, t_obj)
+                if score >= 0.5:  # Порог совпадения
+                    edges.append((i, j, score))
 
-                if score > best_score and score >= 0.5:  # Порог совпадения
-                    best_score = score
-                    best_match = (i, j, score)
+        print(f"Сравнено пар: {compared} из {len(yandex_data) * len(twogis_data)}")
+        return edges
 
-            if best_match:
-                matches.append(best_match)
+    def assign_matches(self, edges: List[Tuple[int, int, float]]) -> List[Tuple[int, int, float]]:
+        """
+        Назначение пар один к одному по всем кандидатам сразу
 
-        return matches
+        Пары сортируются один раз по убыванию оценки (при равенстве - по индексам) и берутся
+        жадно, если оба объекта еще свободны; результат не зависит от порядка входных данных.
+        Связные группы спорных пар не больше exact_assignment_edges решаются точно.
+        """
+        ordered = sorted(edges, key=lambda edge: (-edge[2], edge[0], edge[1]))
 
-    # data_merger.py - в методе calculate_match_score
+        # Связные группы пар (общий объект Яндекс или 2ГИС) через систему непересекающихся множеств
+        parent: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+        def find(node):
+            parent.setdefault(node, node)
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for i, j, _ in ordered:
+            parent[find(('y', i))] = find(('t', j))
+
+        groups: Dict[Tuple[str, int], List[Tuple[int, int, float]]] = {}
+        for edge in ordered:
+            groups.setdefault(find(('y', edge[0])), []).append(edge)
+
+        matches = []
+        exact = 0
+        for group in groups.values():
+            if 1 < len(group) <= self.exact_assignment_edges:
+                matches.extend(self._best_assignment(group))
+                exact += 1
+            else:
+                matches.extend(self._greedy_assignment(group))
+
+        if exact:
+            print(f"Спорных групп решено точно: {exact}")
+        return sorted(matches)
+
+    def _greedy_assignment(self, ordered: List[Tuple[int, int, float]]) -> List[Tuple[int, int, float]]:
+        """Жадное назначение по отсортированным парам"""
+        used_yandex, used_twogis = set(), set()
+        chosen = []
+        for i, j, score in ordered:
+            if i not in used_yandex and j not in used_twogis:
+                chosen.append((i, j, score))
+                used_yandex.add(i)
+                used_twogis.add(j)
+        return chosen
+
+    def _best_assignment(self, ordered: List[Tuple[int, int, float]]) -> List[Tuple[int, int, float]]:
+        """Назначение с максимальной суммой оценок перебором (для небольших групп)"""
+        best: List[Any] = [-1.0, []]
+
+        def search(k: int, used_yandex: Set[int], used_twogis: Set[int], chosen: List, total: float):
+            if k == len(ordered):
+                # Строгое сравнение: при равных суммах остается найденное раньше (ближе к жадному)
+                if total > best[0] + 1e-12:
+                    best[0], best[1] = total, list(chosen)
+                return
+
+            i, j, score = ordered[k]
+            if i not in used_yandex and j not in used_twogis:
+                chosen.append(ordered[k])
+                search(k + 1, used_yandex | {i}, used_twogis | {j}, chosen, total + score)
+                chosen.pop()
+            search(k + 1, used_yandex, used_twogis, chosen, total)
+
+        search(0, set(), set(), [], 0.0)
+        return best[1]
 
     def calculate_match_score(self, yandex_obj: Dict, twogis_obj: Dict) -> float:
         """Вычисление оценки совпадения объектов"""
-        scores = []
-        weights = []
-
-        # 1. Координаты (самый важный критерий)
-        coord1 = yandex_obj.get('Координаты', '')
-        coord2 = twogis_obj.get('Координаты', '')
-
-        if coord1 and coord2:
-            # Убедимся что это строки
-            coord1_str = str(coord1) if coord1 is not None else ''
-            coord2_str = str(coord2) if coord2 is not None else ''
-
-            if coord1_str and coord2_str:
-                if self.coordinates_match(coord1_str, coord2_str):
-                    scores.append(1.0)
-                    weights.append(3.0)  # Высокий вес
-                else:
-                    scores.append(0.0)
-                    weights.append(3.0)
+        return self.score_records(self.match_record(yandex_obj), self.match_record(twogis_obj))
 
-        # 2. Название
-        name1 = yandex_obj.get('Название объекта', '')
-        name2 = twogis_obj.get('Название объекта', '')
+    def distance_score(self, distance):
+        """Оценка близости по расстоянию в метрах (число или массив NumPy):
+        1.0 в одной точке, 0.75 на допуске, 0.0 от удвоенного допуска"""
+        return np.clip(1 - (distance / (2 * self.coord_tolerance_m)) ** 2, 0.0, 1.0)
 
-        if name1 and name2:
-            similarity = self.text_similarity(name1, name2)
-            scores.append(similarity)
-            weights.append(2.0)  # Средний вес
+    def score_records(self, yandex: MatchRecord, twogis: MatchRecord, coord_score: Optional[float] = None) -> float:
+        """
+        Оценка совпадения по заранее вычисленным признакам объектов
 
-        # 3. Адрес
-        addr1 = yandex_obj.get('Адрес', '')
-        addr2 = twogis_obj.get('Адрес', '')
-
-        if addr1 and addr2:
-            addr_sim = self.text_similarity(addr1, addr2)
-            scores.append(addr_sim)
-            weights.append(1.5)
-
-        # 4. Телефон (если есть)
-        phone1 = yandex_obj.get('Телефон', '')
-        phone2 = twogis_obj.get('Телефон', '')
-
-        if phone1 and phone2:
-            # Конвертируем в строки
-            phone1_str = str(phone1) if phone1 is not None else ''
-            phone2_str = str(phone2) if phone2 is not None else ''
-
-            # Нормализуем телефоны
-            norm1 = re.sub(r'[^\d]', '', phone1_str)
-            norm2 = re.sub(r'[^\d]', '', phone2_str)
-
-            if norm1 and norm2:
-                # Проверяем полное совпадение или совпадение последних 7 цифр
-                if norm1 == norm2 or norm1[-7:] == norm2[-7:]:
-                    scores.append(1.0)
+        Args:
+            coord_score: Оценка координат, если уже вычислена (пакетно в find_matches)
+        """
+        weighted_sum = 0.0
+        total_weight = 0.0
+
+        # 1. Координаты (самый важный критерий; неразобранные считаются несовпадением)
+        if yandex.has_coords and twogis.has_coords:
+            if coord_score is None:
+                if yandex.coords and twogis.coords:
+                    coord_score = float(self.distance_score(distance_m(*yandex.coords, *twogis.coords)))
                 else:
-                    scores.append(0.0)
-                weights.append(2.0)
+                    coord_score = 0.0
+            weighted_sum += 3.0 * coord_score
+            total_weight += 3.0
 
-        # Если нет данных для сравнения, возвращаем 0
-        if not scores:
-            return 0.0
+        # 2. Название
+        if yandex.has_name and twogis.has_name:
+            weighted_sum += 2.0 * ngram_similarity(yandex.name_grams, twogis.name_grams)
+            total_weight += 2.0
 
-        # Взвешенное среднее
-        total_weight = sum(weights)
-        weighted_sum = sum(s * w for s, w in zip(scores, weights))
+        # 3. Адрес
+        if yandex.has_address and twogis.has_address:
+            weighted_sum += 1.5 * ngram_similarity(yandex.address_grams, twogis.address_grams)
+            total_weight += 1.5
 
+        # 4. Телефон - совпадение последних 7 цифр любого из номеров
+        if yandex.phones and twogis.phones:
+            if yandex.phones & twogis.phones:
+                weighted_sum += 2.0
+            total_weight += 2.0
+
+        # Взвешенное среднее; если нет данных для сравнения - 0
         return weighted_sum / total_weight if total_weight > 0 else 0.0
 
     def merge_data(self, yandex_data: List[Dict], twogis_data: List[Dict]) -> List[Dict]:
@@ -473,20 +666,19 @@ class DataMerger:
         matches = self.find_matches(yandex_data, twogis_data)
         print(f"Найдено совпадений: {len(matches)}")
 
-        # Собираем индексы уже использованных объектов
+        # Пары уже назначены один к одному
         used_yandex = set()
         used_twogis = set()
         merged_results = []
 
         # Объединяем совпадающие объекты
         for y_idx, t_idx, score in matches:
-            if y_idx not in used_yandex and t_idx not in used_twogis:
-                merged_obj = self.merge_objects(yandex_data[y_idx], twogis_data[t_idx])
-                merged_obj['Уверенность совпадения'] = f"{score:.2f}"
-                merged_results.append(merged_obj)
+            merged_obj = self.merge_objects(yandex_data[y_idx], twogis_data[t_idx])
+            merged_obj['Уверенность совпадения'] = f"{score:.2f}"
+            merged_results.append(merged_obj)
 
-                used_yandex.add(y_idx)
-                used_twogis.add(t_idx)
+            used_yandex.add(y_idx)
+            used_twogis.add(t_idx)
 
         # Добавляем уникальные объекты из Яндекс
         for i, obj in enumerate(yandex_data):
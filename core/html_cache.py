@@ -0,0 +1,183 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict
+
+
+class HtmlCache:
+    """Сжатый content-addressed кэш HTML страниц с ограничением размера (вытеснение LRU)"""
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 2048):
+        """
+        Открытие (или создание) кэша
+
+        Args:
+            cache_dir: Каталог кэша
+            max_size_mb: Максимальный суммарный размер сжатых страниц в МБ
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+
+        self.conn = sqlite3.connect(str(self.cache_dir / "index.sqlite"), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            # Одна страница может быть загружена много раз, содержимое хранится один раз
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT, fetched_at REAL, digest TEXT, PRIMARY KEY (url, fetched_at))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER, last_access REAL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS pages_digest ON pages (digest)")
+            # Данные о странице не из ее HTML (координаты из поисковой выдачи)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS page_meta (url TEXT PRIMARY KEY, coords TEXT)")
+
+        self.total_size = self._stored_size()
+
+    def _stored_size(self) -> int:
+        """Суммарный размер сжатых страниц по индексу"""
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def blob_path(self, digest: str) -> Path:
+        """Путь к файлу содержимого по хэшу"""
+        return self.objects_dir / digest[:2] / f"{digest}.html.gz"
+
+    def put(self, url: str, html: str) -> str:
+        """
+        Сохранение HTML страницы
+
+        Returns:
+            SHA-256 содержимого
+        """
+        raw = html.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        now = time.time()
+
+        exists = self.conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if not exists:
+            path = self.blob_path(digest)
+            path.parent.mkdir(exist_ok=True)
+
+            # Атомарная запись: сначала во временный файл (свой у каждого процесса)
+            compressed = gzip.compress(raw, compresslevel=6)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+            # Кэш общий для процессов-шардов: то же содержимое мог только что записать другой процесс
+            with self.conn:
+                inserted = self.conn.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, size, last_access) VALUES (?, ?, ?)",
+                    (digest, len(compressed), now)
+                ).rowcount
+            if inserted:
+                self.total_size += len(compressed)
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, fetched_at, digest) VALUES (?, ?, ?)",
+                (url, now, digest)
+            )
+            self.conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (now, digest))
+
+        if self.total_size > self.max_size:
+            # Другие процессы тоже пишут в кэш - решение принимается по фактическому размеру
+            self.total_size = self._stored_size()
+            if self.total_size > self.max_size:
+                self._evict()
+
+        return digest
+
+    def put_coords(self, url: str, coords: str):
+        """Сохранение координат объекта из поисковой выдачи (на странице их может не быть)"""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO page_meta (url, coords) VALUES (?, ?)", (url, coords))
+
+    def get_coords(self, url: str) -> Optional[str]:
+        """Координаты объекта из поисковой выдачи, сохраненные вместе со страницей"""
+        row = self.conn.execute("SELECT coords FROM page_meta WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def all_coords(self) -> Dict[str, str]:
+        """Координаты из поисковой выдачи для всех страниц: {url: coords}"""
+        return dict(self.conn.execute("SELECT url, coords FROM page_meta WHERE coords IS NOT NULL").fetchall())
+
+    def _latest_digest(self, url: str, max_age_hours: Optional[float]) -> Optional[str]:
+        """Хэш последней версии страницы (не старше max_age_hours)"""
+        min_fetched_at = time.time() - max_age_hours * 3600 if max_age_hours else 0
+        row = self.conn.execute(
+            "SELECT digest FROM pages WHERE url = ? AND fetched_at >= ? ORDER BY fetched_at DESC LIMIT 1",
+            (url, min_fetched_at)
+        ).fetchone()
+        return row[0] if row else None
+
+    def contains(self, url: str, max_age_hours: Optional[float] = None) -> bool:
+        """Есть ли в кэше версия страницы не старше max_age_hours"""
+        return self._latest_digest(url, max_age_hours) is not None
+
+    def get(self, url: str, max_age_hours: Optional[float] = None) -> Optional[str]:
+        """Последняя сохраненная версия страницы (не старше max_age_hours)"""
+        digest = self._latest_digest(url, max_age_hours)
+        if not digest:
+            return None
+
+        html = self.read_blob(digest)
+        if html is not None:
+            with self.conn:
+                self.conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+        return html
+
+    def read_blob(self, digest: str) -> Optional[str]:
+        """Чтение содержимого по хэшу"""
+        return self.read_file(self.blob_path(digest))
+
+    @staticmethod
+    def read_file(path) -> Optional[str]:
+        """Чтение сжатого файла страницы (без обращения к индексу)"""
+        try:
+            with open(path, 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except (OSError, EOFError):
+            return None
+
+    def latest_pages(self) -> List[Tuple[str, float, str]]:
+        """Последняя версия каждой страницы: [(url, fetched_at, digest)]"""
+        return self.conn.execute(
+            "SELECT url, MAX(fetched_at), digest FROM pages GROUP BY url ORDER BY url"
+        ).fetchall()
+
+    def _evict(self):
+        """Вытеснение давно не использованных страниц до 90% лимита размера"""
+        target = int(self.max_size * 0.9)
+        evicted = 0
+
+        rows = self.conn.execute("SELECT digest, size FROM blobs ORDER BY last_access").fetchall()
+        with self.conn:
+            for digest, size in rows:
+                if self.total_size <= target:
+                    break
+                try:
+                    self.blob_path(digest).unlink()
+                except OSError:
+                    pass
+                self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                self.conn.execute("DELETE FROM pages WHERE digest = ?", (digest,))
+                self.total_size -= size
+                evicted += 1
+
+        if evicted:
+            print(f"🗑 Кэш HTML: вытеснено {evicted} страниц, размер {self.total_size / 1024 / 1024:.1f} МБ")
+
+    def close(self):
+        """Закрытие кэша"""
+        try:
+            self.conn.close()
+        except Exception as e:
+            print(f"⚠️ Ошибка при закрытии кэша HTML: {e}")
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Ведро токенов: не больше rate запросов в секунду с накоплением до burst"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Запросов в секунду в установившемся режиме
+            burst: Сколько запросов можно выполнить подряд после простоя
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        self.acquired = 0  # Выданных разрешений
+        self.waited = 0.0  # Суммарное ожидание (сек)
+
+    def _refill(self):
+        """Пополнение токенов за прошедшее время"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate: float):
+        """Изменение частоты (накопленные по старой частоте токены сохраняются)"""
+        self._refill()
+        self.rate = rate
+
+    async def acquire(self):
+        """Ожидание разрешения на запрос (ожидающие обслуживаются по очереди)"""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                self.waited += wait
+                await asyncio.sleep(wait)
+                self._refill()
+
+            self.tokens -= 1
+            self.acquired += 1
+
+
+class HostRateLimiter:
+    """Лимиты запросов по хостам; одно ведро на хост для всех вкладок и этапов"""
+
+    def __init__(self, limits: Dict[str, Dict[str, float]], default_rate: float, default_burst: int = 1):
+        """
+        Args:
+            limits: Хост -> {'rate': запросов/сек, 'burst': запас}; поддомены используют лимит хоста
+            default_rate: Лимит для остальных хостов (запросов/сек)
+            default_burst: Запас для остальных хостов
+        """
+        self.limits = limits
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def host_key(self, url: str) -> str:
+        """Хост из настроек, к которому относится URL"""
+        host = (urlparse(url).hostname or '').lower()
+        for key in self.limits:
+            if host == key or host.endswith('.' + key):
+                return key
+        return host
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Ведро токенов хоста URL"""
+        key = self.host_key(url)
+        if key not in self.buckets:
+            limit = self.limits.get(key, {})
+            self.buckets[key] = TokenBucket(limit.get('rate', self.default_rate),
+                                            int(limit.get('burst', self.default_burst)))
+        return self.buckets[key]
+
+    async def acquire(self, url: str):
+        """Ожидание разрешения на запрос к хосту URL"""
+        await self.bucket(url).acquire()
+
+    def print_stats(self):
+        """Вывод статистики ожидания по хостам"""
+        print(f"\n🚦 ЛИМИТЫ ЗАПРОСОВ:")
+        for key, bucket in self.buckets.items():
+            print(f"   {key}: {bucket.acquired} запросов, {bucket.rate:.2f}/с, "
+                  f"ожидание {bucket.waited:.0f}с")
+
+
+_shared_limiter: Optional[HostRateLimiter] = None
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Общий для всех парсеров процесса лимитер запросов (создается из Config.RATE_LIMIT)"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        from config import Config
+
+        settings = Config.RATE_LIMIT
+        default_rate = settings['default_rate']
+        if default_rate is None:
+            # Средняя пауза между запросами из общих настроек парсинга
+            default_rate = 2 / (Config.PARSING['delay_min'] + Config.PARSING['delay_max'])
+        _shared_limiter = HostRateLimiter(settings['hosts'], default_rate, settings['default_burst'])
+    return _shared_limiter
@@ -0,0 +1,100 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from core.html_cache import HtmlCache
+
+# Парсеры создаются один раз на процесс-воркер
+_parsers: Dict[str, Any] = {}
+
+
+def detect_source(url: str) -> Optional[str]:
+    """Определение источника по URL страницы"""
+    if 'yandex.' in url:
+        return 'yandex'
+    if '2gis.' in url:
+        return '2gis'
+    return None
+
+
+def _get_parser(source: str):
+    """Парсер источника для текущего процесса (браузер не запускается)"""
+    if source not in _parsers:
+        from parsers.yandex_parser import YandexParser
+        from parsers.twogis_parser import TwoGisParser
+
+        parser_class = YandexParser if source == 'yandex' else TwoGisParser
+        _parsers[source] = parser_class(headless=True)
+    return _parsers[source]
+
+
+def _reextract_page(task: Tuple[str, str, str, float, Optional[str]]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Извлечение записи из сохраненной страницы (выполняется в процессе-воркере)"""
+    source, url, blob_path, fetched_at, preview_coords = task
+    html = HtmlCache.read_file(blob_path)
+    if html is None:
+        return source, None
+
+    try:
+        record = _get_parser(source)._record_from_html(url, html, preview_coords)
+    except Exception as e:
+        print(f"   ✗ Ошибка извлечения {url[:60]}: {str(e)[:50]}")
+        return source, None
+
+    if record:
+        # Время записи - время загрузки страницы, а не повторного извлечения
+        record['timestamp'] = datetime.fromtimestamp(fetched_at).strftime("%Y-%m-%d %H:%M:%S")
+    return source, record
+
+
+def reextract_from_cache(cache_dir: str, workers: Optional[int] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Повторное извлечение данных из кэша HTML без браузера
+
+    Args:
+        cache_dir: Каталог кэша HTML
+        workers: Количество процессов (по умолчанию - число ядер)
+
+    Returns:
+        Кортеж (данные Яндекс, данные 2ГИС)
+    """
+    cache = HtmlCache(cache_dir)
+    coords = cache.all_coords()  # Координаты из поисковой выдачи (у 2ГИС их нет на странице)
+    tasks = []
+    for url, fetched_at, digest in cache.latest_pages():
+        source = detect_source(url)
+        if source:
+            tasks.append((source, url, str(cache.blob_path(digest)), fetched_at, coords.get(url)))
+    cache.close()
+
+    workers = workers or os.cpu_count() or 1
+    print(f"📦 Страниц в кэше: {len(tasks)} | Процессов: {workers}")
+
+    start_time = time.time()
+    results: Dict[str, List[Dict]] = {'yandex': [], '2gis': []}
+    failed = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        for i, (source, record) in enumerate(executor.map(_reextract_page, tasks, chunksize=chunksize), 1):
+            if record:
+                results[source].append(record)
+            else:
+                failed += 1
+
+            if i % 500 == 0 or i == len(tasks):
+                print(f"   📊 Обработано {i}/{len(tasks)} ({time.time() - start_time:.0f}с)")
+
+    # Удаление дубликатов теми же правилами, что и при живом парсинге
+    for source in results:
+        parser = _get_parser(source)
+        parser.results = results[source]
+        parser._remove_duplicates()
+        results[source] = parser.results
+
+    print(f"✅ Извлечено: Яндекс {len(results['yandex'])}, 2ГИС {len(results['2gis'])}, "
+          f"без данных {failed} за {time.time() - start_time:.0f}с")
+
+    return results['yandex'], results['2gis']
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+from urllib.parse import urlparse
+
+from config import Config
+from core.crawl_journal import CrawlJournal, journal_path
+
+
+def _parser_class(source: str):
+    """Класс парсера источника"""
+    from parsers.yandex_parser import YandexParser
+    from parsers.twogis_parser import TwoGisParser
+
+    return YandexParser if source == 'yandex' else TwoGisParser
+
+
+def _source_rate(source: str) -> float:
+    """Лимит запросов в секунду к хосту источника (общий для всех шардов)"""
+    settings = Config.RATE_LIMIT
+    base_url = Config.YANDEX['base_url'] if source == 'yandex' else Config.TWOGIS['base_url']
+    host = urlparse(base_url).hostname or ''
+    for pattern, limit in settings['hosts'].items():
+        if host == pattern or host.endswith('.' + pattern):
+            return limit['rate']
+
+    if settings['default_rate'] is not None:
+        return settings['default_rate']
+    return 2 / (Config.PARSING['delay_min'] + Config.PARSING['delay_max'])
+
+
+def _scale_rate_limits(count: int):
+    """Доля лимитов запросов на один шард (все шарды вместе укладываются в общий лимит)"""
+    settings = Config.RATE_LIMIT
+    for limit in settings['hosts'].values():
+        limit['rate'] = limit['rate'] / count
+
+    default_rate = settings['default_rate']
+    if default_rate is None:
+        default_rate = 2 / (Config.PARSING['delay_min'] + Config.PARSING['delay_max'])
+    settings['default_rate'] = default_rate / count
+
+    Config.CRAWL['autotune_min_rate'] /= count
+    Config.CRAWL['autotune_max_rate'] /= count
+    Config.CRAWL['autotune_rate_step'] /= count
+
+
+def _run_shard(task: Tuple[str, int, int, Dict[str, Any], str]) -> Tuple[str, int]:
+    """Парсинг доли зон в отдельном процессе со своим браузером"""
+    from utils.console import output_prefix, prefixed_output
+
+    source, index, count, options, output_path = task
+    _scale_rate_limits(count)
+
+    output_prefix.set(f"[{source} {index + 1}/{count}] ")
+    with prefixed_output():
+        parser = _parser_class(source)(shard=(index, count), **options)
+        results = asyncio.run(parser.parse())
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результаты шарда: {output_path} ({len(results)} объектов)")
+
+    return output_path, len(results)
+
+
+def merge_shard_results(source: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Удаление дубликатов между шардами по каноническому ID организации"""
+    parser = _parser_class(source)(headless=True)
+
+    unique: Dict[str, Dict[str, Any]] = {}
+    without_url = []
+    for record in records:
+        url = record.get('Ссылка на объект') or record.get('Ссылка', '')
+        if url:
+            unique.setdefault(parser._generate_parking_id(url), record)
+        else:
+            without_url.append(record)
+
+    parser.results = list(unique.values()) + without_url
+    parser._remove_duplicates()
+
+    removed = len(records) - len(parser.results)
+    if removed > 0:
+        print(f"🗑 {source}: удалено {removed} дубликатов между шардами")
+    return parser.results
+
+
+def run_sharded(source: str, count: int, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Парсинг источника в count процессах, каждый со своим браузером и долей зон
+
+    Args:
+        source: 'yandex' или '2gis'
+        count: Количество процессов-шардов
+        options: Аргументы конструктора парсера (headless, concurrency, ...)
+
+    Returns:
+        Объединенные записи всех шардов без дубликатов
+    """
+    shard_dir = Path(Config.CRAWL['shard_dir'])
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    tasks = [
+        (source, index, count, options, str(shard_dir / f"{source}_{timestamp}_shard{index + 1}of{count}.json"))
+        for index in range(count)
+    ]
+
+    # Журнал источника общий для шардов: прогон начинается (или сбрасывается) один раз
+    journal = CrawlJournal(journal_path(Config.CRAWL['journal_dir'], source))
+    journal.start_run(options.get('resume', False))
+    journal.close()
+
+    print(f"🧮 {source}: запускаем {count} процессов-шардов...")
+    rate = _source_rate(source)
+    print(f"   Лимит запросов {rate:.2f}/с делится между шардами: {rate / count:.2f}/с на шард. "
+          f"Если скорость ограничена лимитом, шарды ее не увеличивают")
+    start_time = time.time()
+    records = []
+
+    # spawn: дочерний процесс не наследует цикл событий и потоки родителя
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=count, mp_context=context) as executor:
+        futures = {executor.submit(_run_shard, task): task for task in tasks}
+        for future in as_completed(futures):
+            index = futures[future][1]
+            try:
+                output_path, found = future.result()
+            except Exception as e:
+                print(f"❌ {source}: шард {index + 1}/{count} завершился ошибкой: {e}")
+                continue
+
+            with open(output_path, 'r', encoding='utf-8') as f:
+                records.extend(json.load(f))
+            print(f"✅ {source}: шард {index + 1}/{count} готов ({found} объектов)")
+
+    print(f"🧮 {source}: шарды завершены за {time.time() - start_time:.0f}с, записей: {len(records)}")
+    return merge_shard_results(source, records)
@@ -0,0 +1,69 @@
+import math
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180  # Метров в градусе широты
+
+
+def distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Расстояние между точками в метрах (равнопромежуточная проекция, точна на масштабах города)"""
+    mean_lat = math.radians((lat1 + lat2) / 2)
+    d_lat = lat2 - lat1
+    d_lon = (lon2 - lon1) * math.cos(mean_lat)
+    return METERS_PER_DEGREE * math.hypot(d_lat, d_lon)
+
+
+def distances_m(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Расстояния в метрах между парами точек из массивов (та же формула, что distance_m)"""
+    mean_lat = np.radians((lat1 + lat2) / 2)
+    d_lat = lat2 - lat1
+    d_lon = (lon2 - lon1) * np.cos(mean_lat)
+    return METERS_PER_DEGREE * np.hypot(d_lat, d_lon)
+
+
+def grid_cell_degrees(radius_m: float, max_abs_lat: float) -> Tuple[float, float]:
+    """Размер ячейки GridIndex (градусы широты и долготы), покрывающей радиус radius_m до широты max_abs_lat"""
+    cell_lat = radius_m / METERS_PER_DEGREE
+    cell_lon = cell_lat / max(math.cos(math.radians(min(abs(max_abs_lat), 85.0))), 1e-6)
+    return cell_lat, cell_lon
+
+
+class GridIndex:
+    """
+    Равномерная сетка по координатам: точка попадает в ячейку cell_lat x cell_lon,
+    кандидаты для точки - содержимое ее ячейки и 8 соседних. Если размер ячейки не меньше
+    радиуса поиска, все точки в радиусе гарантированно попадают в кандидаты.
+    """
+
+    def __init__(self, cell_lat: float, cell_lon: float):
+        """
+        Args:
+            cell_lat: Размер ячейки по широте (градусы)
+            cell_lon: Размер ячейки по долготе (градусы)
+        """
+        self.cell_lat = cell_lat
+        self.cell_lon = cell_lon
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.size = 0
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Ячейка точки"""
+        return math.floor(lat / self.cell_lat), math.floor(lon / self.cell_lon)
+
+    def add(self, key: int, lat: float, lon: float):
+        """Добавление точки с ключом key (например, индексом записи)"""
+        self.cells[self._cell(lat, lon)].append(key)
+        self.size += 1
+
+    def nearby(self, lat: float, lon: float) -> List[int]:
+        """Ключи точек из ячейки точки и соседних (по возрастанию)"""
+        row, col = self._cell(lat, lon)
+        keys = []
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                keys.extend(self.cells.get((row + d_row, col + d_col), ()))
+        keys.sort()
+        return keys
@@ -14,6 +14,10 @@ from parsers.twogis_parser import TwoGisParser
 from parsers.yandex_parser import YandexParser
 from core.excel_writer import ExcelWriter
 from core.data_merger import DataMerger
+from core.reextractor import reextract_from_cache
+from core.sharding import run_sharded
+from utils.console import output_prefix, prefixed_output
+from config import Config
 
 
 def parse_arguments():
@@ -29,6 +33,36 @@ def parse_arguments():
     parser.add_argument('--skip-2gis', action='store_true',
                         help='Пропустить парсинг 2ГИС')
 
+    parser.add_argument('--parallel', action='store_true',
+                        help='Парсить Яндекс Карты и 2ГИС одновременно (два браузера)')
+
+    parser.add_argument('--shards', type=int, default=1,
+                        help='Разделить зоны источника между N процессами, каждый со своим браузером. '
+                             'Лимит запросов к хосту (Config.RATE_LIMIT) общий: каждый шард получает 1/N, '
+                             'поэтому при упоре в лимит скорость не растет')
+
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='Количество вкладок для параллельного парсинга объектов (по умолчанию из config.py)')
+
+    parser.add_argument('--resume', action='store_true',
+                        help='Продолжить прерванный прогон из журнала (пропустить пройденные зоны и распарсенные URL)')
+
+    parser.add_argument('--ttl-hours', type=float, default=None,
+                        help='Инкрементальный режим: не перезагружать объекты, распарсенные за последние N часов')
+
+    parser.add_argument('--cache-max-age', type=float, default=None,
+                        help='Брать страницы объектов из кэша HTML, если они не старше N часов')
+
+    parser.add_argument('--no-block-resources', action='store_true',
+                        help='Не блокировать картинки, шрифты, медиа и аналитику в браузере')
+
+    parser.add_argument('--reextract', nargs='?', const=Config.HTML_CACHE['cache_dir'], default=None,
+                        metavar='CACHE_DIR',
+                        help='Повторно извлечь данные из кэша HTML без браузера (по умолчанию каталог из config.py)')
+
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Количество процессов для --reextract (по умолчанию - число ядер)')
+
     parser.add_argument('--merge-only', action='store_true',
                         help='Только объединение существующих данных (без парсинга)')
 
@@ -186,41 +220,8 @@ async def merge_existing_data(yandex_file: str = None, twogis_file: str = None):
     print("=" * 70)
 
 
-async def main():
-    args = parse_arguments()
-
-    # Если указан режим только объединения
-    if args.merge_only:
-        await merge_existing_data(args.yandex_file, args.twogis_file)
-        return
-
-    print("=" * 70)
-    print("🚗 ПАРСИНГ ПАРКОВОК: Яндекс Карты + 2ГИС")
-    print("=" * 70)
-
-    print(f"⚙ Настройки:")
-    print(f"   Headless режим: {'Да' if args.headless else 'Нет'}")
-    print(f"   Яндекс Карты: {'Пропущено' if args.skip_yandex else 'Включено'}")
-    print(f"   2ГИС: {'Пропущено' if args.skip_2gis else 'Включено'}")
-    print("-" * 70)
-
-    # Инициализация
-    writer = ExcelWriter()
-    yandex_data = []
-    twogis_data = []
-
-    if not args.skip_yandex:
-        print("\n1. 📍 Парсинг Яндекс Карт...")
-        yandex_parser = YandexParser(headless=args.headless)
-        yandex_data = await yandex_parser.parse()
-        print(f"   ✅ Яндекс: собрано {len(yandex_data)} объектов")
-
-    if not args.skip_2gis:
-        print("\n2. 🗺️ Парсинг 2ГИС...")
-        twogis_parser = TwoGisParser(headless=args.headless)
-        twogis_data = await twogis_parser.parse()
-        print(f"   ✅ 2ГИС: собрано {len(twogis_data)} объектов")
-
+def save_and_merge_results(writer: ExcelWriter, yandex_data: list, twogis_data: list):
+    """Сохранение результатов парсинга по источникам и объединенного отчета"""
     # Сохранение отдельных файлов
     print("\n3. 💾 Сохранение отдельных файлов...")
     yandex_files = []
@@ -296,6 +297,139 @@ async def main():
     print("=" * 70)
 
 
+
+def reextract_cached_pages(cache_dir: str, workers: int = None):
+    """Повторное извлечение данных из кэша HTML и сохранение как после обычного парсинга"""
+    print("=" * 70)
+    print("📦 ПОВТОРНОЕ ИЗВЛЕЧЕНИЕ ДАННЫХ ИЗ КЭША HTML")
+    print("=" * 70)
+    print(f"   Каталог кэша: {cache_dir}")
+    print("-" * 70)
+
+    if not os.path.isdir(cache_dir):
+        print(f"❌ Каталог кэша не найден: {cache_dir}")
+        return
+
+    yandex_data, twogis_data = reextract_from_cache(cache_dir, workers)
+    save_and_merge_results(ExcelWriter(), yandex_data, twogis_data)
+
+
+async def main():
+    args = parse_arguments()
+
+    # Если указан режим только объединения
+    if args.merge_only:
+        await merge_existing_data(args.yandex_file, args.twogis_file)
+        return
+
+    # Повторное извлечение из кэша HTML без браузера
+    if args.reextract:
+        reextract_cached_pages(args.reextract, args.workers)
+        return
+
+    print("=" * 70)
+    print("🚗 ПАРСИНГ ПАРКОВОК: Яндекс Карты + 2ГИС")
+    print("=" * 70)
+
+    print(f"⚙ Настройки:")
+    print(f"   Headless режим: {'Да' if args.headless else 'Нет'}")
+    print(f"   Яндекс Карты: {'Пропущено' if args.skip_yandex else 'Включено'}")
+    print(f"   2ГИС: {'Пропущено' if args.skip_2gis else 'Включено'}")
+    print(f"   Параллельно: {'Да' if args.parallel else 'Нет'}")
+    print(f"   Процессов на источник: {args.shards}")
+    print(f"   Продолжение прогона: {'Да' if args.resume else 'Нет'}")
+    print(f"   TTL записей: {args.ttl_hours or Config.CRAWL['record_ttl_hours'] or 'Нет'}")
+    print(f"   Страницы из кэша HTML: {args.cache_max_age or Config.HTML_CACHE['max_age_hours'] or 'Нет'}")
+    block_resources = Config.RESOURCE_BLOCKING['enabled'] and not args.no_block_resources
+    print(f"   Блокировка ресурсов: {'Да' if block_resources else 'Нет'}")
+    print(f"   Вкладок для парсинга объектов: {args.concurrency or Config.CRAWL['concurrency']}")
+    print("-" * 70)
+
+    # Инициализация
+    writer = ExcelWriter()
+    yandex_data = []
+    twogis_data = []
+
+    if args.parallel:
+        yandex_data, twogis_data = await run_parsers_parallel(args)
+    else:
+        if not args.skip_yandex:
+            print("\n1. 📍 Парсинг Яндекс Карт...")
+            yandex_data = await crawl_source('yandex', YandexParser, args)
+            print(f"   ✅ Яндекс: собрано {len(yandex_data)} объектов")
+
+        if not args.skip_2gis:
+            print("\n2. 🗺️ Парсинг 2ГИС...")
+            twogis_data = await crawl_source('2gis', TwoGisParser, args)
+            print(f"   ✅ 2ГИС: собрано {len(twogis_data)} объектов")
+
+    save_and_merge_results(writer, yandex_data, twogis_data)
+
+
+def parser_options(args) -> dict:
+    """Настройки парсера из аргументов командной строки"""
+    return {
+        'headless': args.headless,
+        'concurrency': args.concurrency,
+        'resume': args.resume,
+        'record_ttl_hours': args.ttl_hours,
+        'cache_max_age_hours': args.cache_max_age,
+        'block_resources': False if args.no_block_resources else None,
+    }
+
+
+def create_parser(parser_class, args):
+    """Создание парсера с настройками из аргументов командной строки"""
+    return parser_class(**parser_options(args))
+
+
+async def crawl_source(source: str, parser_class, args) -> list:
+    """Парсинг источника в текущем процессе или в нескольких процессах-шардах (--shards)"""
+    if args.shards > 1:
+        return await asyncio.to_thread(run_sharded, source, args.shards, parser_options(args))
+    return await create_parser(parser_class, args).parse()
+
+
+async def run_parser_task(source: str, label: str, parser_class, args) -> list:
+    """Парсинг одного источника в отдельной задаче; строки вывода помечаются источником"""
+    output_prefix.set(f"[{label}] ")
+    data = await crawl_source(source, parser_class, args)
+    print(f"   ✅ {label}: собрано {len(data)} объектов")
+    return data
+
+
+async def run_parsers_parallel(args):
+    """
+    Одновременный парсинг Яндекс Карт и 2ГИС (у каждого свой браузер).
+    Ошибка одного источника не останавливает другой.
+
+    Returns:
+        Кортеж (данные Яндекс, данные 2ГИС)
+    """
+    sources = []
+    if not args.skip_yandex:
+        sources.append(('yandex', 'Яндекс', YandexParser))
+    if not args.skip_2gis:
+        sources.append(('2gis', '2ГИС', TwoGisParser))
+
+    print(f"\n1-2. ⚡ Параллельный парсинг: {', '.join(label for _, label, _ in sources)}...")
+
+    with prefixed_output():
+        results = await asyncio.gather(
+            *(run_parser_task(source, label, parser_class, args) for source, label, parser_class in sources),
+            return_exceptions=True
+        )
+
+    data = {'yandex': [], '2gis': []}
+    for (source, label, _), result in zip(sources, results):
+        if isinstance(result, BaseException):
+            print(f"   ❌ {label}: парсинг завершился ошибкой: {result}")
+        else:
+            data[source] = result
+
+    return data['yandex'], data['2gis']
+
+
 if __name__ == "__main__":
     asyncio.run(main())
 
@@ -303,3 +437,6 @@ if __name__ == "__main__":
 # python main.py --merge-only
 # python main.py --skip-yandex
 # python main.py --skip-2gis
+# python main.py --parallel --headless
+# python main.py --headless --shards 4
+# python main.py --reextract results/html_cache
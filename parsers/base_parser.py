@@ -1,26 +1,128 @@
 import asyncio
+import hashlib
+import json
 import random
 import re
 import time
+import zlib
+from collections import deque
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any, Set
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Set, Tuple
 from datetime import datetime
 
 import nodriver
 from bs4 import BeautifulSoup
 
+from config import Config
+from core.crawl_journal import CrawlJournal, journal_path
+from core.html_cache import HtmlCache
+from core.rate_limiter import get_rate_limiter
+from core import crawl_tuner
+from core.crawl_tuner import CrawlTuner
+from .resource_blocker import ResourceBlocker
+from .network_collector import SearchResponseCollector
+from .link_harvester import LinkHarvester
+from .zone_planner import ZonePlanner
+from .browser_manager import BrowserManager
+from .page_context import PageContext
+
+# Загрузка страницы объекта, которую выполняет текущая задача: время ожидания лимита
+# запросов не входит в таймаут страницы, исход учитывается один раз на URL
+# (см. BaseParser._start_page_task)
+_page_state: ContextVar[Optional[Dict[str, Any]]] = ContextVar('page_state', default=None)
+
 
 class BaseParser(ABC):
     """Базовый класс для всех парсеров"""
 
-    def __init__(self, headless: bool = True):
+    # Признаки незавершенной загрузки страницы (спиннеры, заглушки)
+    loading_selectors = [
+        '.spin2', '.spinner', '.loading', '.loader',
+        '[class*="loading"]', '[class*="spinner"]'
+    ]
+
+    # Границы города для зон поиска (lat_min, lat_max, lon_min, lon_max)
+    city_bbox = (59.85, 60.05, 30.15, 30.70)
+
+    def __init__(self, headless: bool = True, concurrency: Optional[int] = None, resume: bool = False,
+                 record_ttl_hours: Optional[float] = None, cache_max_age_hours: Optional[float] = None,
+                 block_resources: Optional[bool] = None, shard: Optional[Tuple[int, int]] = None):
         self.headless = headless
+        self.shard = shard  # (номер с 0, всего) - доля зон для процесса при шардировании
+        self.concurrency = max(1, concurrency or Config.CRAWL['concurrency'])
+        self.resume = resume
+        self.record_ttl_hours = record_ttl_hours or Config.CRAWL['record_ttl_hours']
+        self.cache_max_age_hours = cache_max_age_hours or Config.HTML_CACHE['max_age_hours']
         self.browser: Optional[nodriver.Browser] = None
+        self.browser_manager = BrowserManager(
+            self._restart_browser,
+            max_pages=Config.BROWSER['max_pages'],
+            max_rss_mb=Config.BROWSER['max_rss_mb'],
+            rss_check_every=Config.BROWSER['rss_check_every']
+        )
         self.results: List[Dict[str, Any]] = []
         self.start_time = None
         self.all_urls: Set[str] = set()
         self.max_consecutive_no_new = 3  # Максимум 3 попытки без новых URL
 
+        # Лимит частоты запросов по хостам (общий для всех вкладок)
+        self.rate_limiter = get_rate_limiter()
+
+        # Очередь этапа парсинга объектов (существует, пока идет этап 2)
+        self._url_queue: Optional[asyncio.Queue] = None
+        self._progress: Dict[str, Any] = {}
+        self.tuner: Optional[CrawlTuner] = None  # Автонастройка темпа этапа парсинга объектов
+
+        # Таймауты операций браузера по виду и возвраты URL в очередь после таймаута
+        self._timeouts: Dict[str, int] = {}
+        self._requeues: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}  # URL -> время, раньше которого не повторять
+
+        # Дублирующие запросы для медленных страниц объектов
+        self._page_times: deque = deque(maxlen=Config.HEDGING['window'])  # Время загрузки страниц (сек)
+        self._spare_tabs: List[Any] = []  # Свободные запасные вкладки: (вкладка, запуск браузера)
+        self._spare_tabs_open = 0
+        self._hedges = {'issued': 0, 'won': 0}
+
+        # Журнал обхода на диске (открывается в начале parse)
+        self.journal: Optional[CrawlJournal] = None
+        self._done_zones: Set[str] = set()
+        self._zone_urls: Optional[Set[str]] = None  # Все URL выдачи текущей зоны (и уже известные)
+        self._fresh_records: Dict[str, Dict[str, Any]] = {}  # ID объекта -> свежая запись из журнала
+
+        # Время до готовности страниц (сек) по виду страницы и число таймаутов ожидания
+        self._ready_times: Dict[str, List[float]] = {}
+        self._ready_timeouts: Dict[str, int] = {}
+
+        # Кэш HTML страниц объектов (открывается в начале parse)
+        self.html_cache: Optional[HtmlCache] = None
+
+        # Блокировка картинок, шрифтов, медиа и аналитики во всех вкладках
+        if block_resources is None:
+            block_resources = Config.RESOURCE_BLOCKING['enabled']
+        self.resource_blocker: Optional[ResourceBlocker] = None
+        if block_resources:
+            self.resource_blocker = ResourceBlocker(
+                Config.RESOURCE_BLOCKING['resource_types'],
+                Config.RESOURCE_BLOCKING['url_patterns'],
+                Config.RESOURCE_BLOCKING['avg_bytes']
+            )
+
+        # Перехват JSON-ответов поиска при сборе URL по зонам
+        self.search_collector: Optional[SearchResponseCollector] = None
+        if Config.CRAWL['capture_search_responses'] and self._search_api_patterns():
+            self.search_collector = SearchResponseCollector(
+                self._search_api_patterns(),
+                self._parse_search_payload
+            )
+
+        # Сбор ссылок выдачи наблюдателем DOM (прирост вместо полного outerHTML)
+        self.link_harvester: Optional[LinkHarvester] = None
+        if Config.CRAWL['harvest_links_in_page'] and self._result_link_pattern():
+            self.link_harvester = LinkHarvester(self._result_link_pattern())
+
     # === ОБЩИЕ МЕТОДЫ ИНИЦИАЛИЗАЦИИ ===
 
     async def init_browser(self) -> bool:
@@ -62,16 +164,22 @@ class BaseParser(ABC):
                 f"--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             ]
 
-            self.browser = await nodriver.start(
+            # Каждый шаг ограничен таймаутом: при перезапуске браузера воркеры ждут его окончания
+            self.browser = await self._with_timeout(nodriver.start(
                 headless=self.headless,
                 window_size=(1200, 900),
                 disable_features=[],
                 args=args
-            )
+            ), 'launch')
+            self.browser_manager.attach(self.browser)
 
             # Дополнительно: скрываем WebDriver флаги через JavaScript
-            page = await self.browser.get('about:blank')
-            await page.evaluate("""
+            page = await self._with_timeout(self.browser.get('about:blank'), 'navigation')
+            await self._prepare_tab(page)
+
+            # Основная вкладка используется для зон: слушаем ответы поиска до первой навигации
+            await self._attach_search_collector(page)
+            await self._with_timeout(page.evaluate("""
                 Object.defineProperty(navigator, 'webdriver', {
                     get: () => undefined
                 });
@@ -79,24 +187,190 @@ class BaseParser(ABC):
                 window.chrome = {
                     runtime: {}
                 };
-            """)
+            """), 'evaluate')
 
             print("✅ Браузер запущен")
             return True
         except Exception as e:
-            print(f"❌ Ошибка запуска браузера: {e}")
+            print(f"❌ Ошибка запуска браузера: {e or type(e).__name__}")
+            # Наполовину запущенный браузер не оставляем: вкладки воркеров откроются с ошибкой
+            # и вернут свои URL в очередь
+            await self.browser_manager.stop(self.browser)
+            self.browser = None
             return False
 
+    async def _restart_browser(self) -> bool:
+        """Остановка браузера и запуск нового (вкладки старого становятся недействительны)"""
+        await self.browser_manager.stop(self.browser)
+        self.browser = None
+        return await self.init_browser()
+
+    def _open_journal(self) -> List[str]:
+        """
+        Открытие журнала обхода.
+
+        Свежими считаются записи текущего прогона (при --resume) и записи моложе
+        record_ttl_hours: такие URL не загружаются повторно.
+
+        Returns:
+            URL, найденные в продолжаемом прогоне (--resume)
+        """
+        path = journal_path(Config.CRAWL['journal_dir'], self.source_name)
+        self.journal = CrawlJournal(path)
+        # Журнал не зависит от числа шардов; при шардировании прогон начинает
+        # (или сбрасывает) родительский процесс до запуска шардов
+        run_started_at = self.journal.start_run(self.resume or bool(self.shard))
+
+        cutoffs = []
+        if self.resume:
+            cutoffs.append(run_started_at)
+        if self.record_ttl_hours:
+            cutoffs.append(time.time() - self.record_ttl_hours * 3600)
+
+        self._fresh_records = self.journal.records_since(min(cutoffs)) if cutoffs else {}
+        if self.record_ttl_hours:
+            print(f"🕒 Свежих записей в журнале (TTL {self.record_ttl_hours} ч): {len(self._fresh_records)}")
+
+        if not self.resume:
+            return []
+
+        self._done_zones = self.journal.done_zones()
+        pending = [url for url in self.journal.discovered_urls() if self._owns_url(url)]
+        self.all_urls.update(pending)
+        not_parsed = sum(1 for url in pending if self._generate_parking_id(url) not in self._fresh_records)
+
+        print(f"♻️ Продолжаем прогон из журнала {path}:")
+        print(f"   Зон пройдено: {len(self._done_zones)} | URL: {len(self.all_urls)} | "
+              f"Ожидают парсинга: {not_parsed}")
+        return pending
+
+    def _open_html_cache(self):
+        """Открытие кэша HTML страниц объектов"""
+        if not Config.HTML_CACHE['enabled']:
+            return
+
+        self.html_cache = HtmlCache(Config.HTML_CACHE['cache_dir'], Config.HTML_CACHE['max_size_mb'])
+        if self.cache_max_age_hours:
+            print(f"📦 Страницы из кэша HTML не старше {self.cache_max_age_hours} ч не загружаются")
+
+    def _has_cached_html(self, url: str) -> bool:
+        """Есть ли в кэше достаточно свежая версия страницы"""
+        return bool(self.html_cache and self.cache_max_age_hours
+                    and self.html_cache.contains(url, self.cache_max_age_hours))
+
+    def _get_cached_html(self, url: str) -> Optional[str]:
+        """Достаточно свежая версия страницы из кэша (если разрешено --cache-max-age)"""
+        if not self._has_cached_html(url):
+            return None
+        return self.html_cache.get(url, self.cache_max_age_hours)
+
+    def _store_html(self, url: str, html: str):
+        """Сохранение загруженной страницы в кэш (вместе с координатами из поисковой выдачи)"""
+        if self.html_cache and html:
+            try:
+                self.html_cache.put(url, html)
+                coords = self._search_preview_coords(url)
+                if coords:
+                    self.html_cache.put_coords(url, coords)
+            except Exception as e:
+                print(f"   ⚠ Не удалось сохранить страницу в кэш: {str(e)[:50]}")
+
+    def _owns_url(self, url: str) -> bool:
+        """Достается ли URL из журнала этому шарду (доля по ID объекта, при любом числе шардов)"""
+        if not self.shard:
+            return True
+        index, count = self.shard
+        return zlib.crc32(self._generate_parking_id(url).encode('utf-8')) % count == index
+
+    def _shard_suffix(self) -> str:
+        """Суффикс файлов состояния процесса-шарда ('' без шардирования)"""
+        if not self.shard:
+            return ''
+        index, count = self.shard
+        return f"_shard{index + 1}of{count}"
+
+    def _create_zone_planner(self) -> ZonePlanner:
+        """План обхода зон: адаптивное квадродерево или фиксированная сетка z=14"""
+        settings = Config.ZONES
+        if settings['planner'] != 'quadtree':
+            zones = self.generate_grid_z14()
+            if self.shard:
+                index, count = self.shard
+                zones = zones[index::count]
+            return ZonePlanner.fixed(zones)
+
+        source_config = Config.YANDEX if self.source_name == 'yandex' else Config.TWOGIS
+        planner = ZonePlanner(
+            self.city_bbox,
+            self._build_zone_url,
+            start_zoom=settings['start_zoom'],
+            max_zoom=settings['max_zoom'],
+            saturation=source_config['zone_saturation'],
+            state_path=Path(settings['state_dir']) / f"{self.source_name}_quadtree{self._shard_suffix()}.json",
+            empty_ttl_days=settings['empty_recheck_days'],
+            shard=self.shard
+        )
+        print(f"🧩 Адаптивные зоны: z={settings['start_zoom']}..{settings['max_zoom']}, "
+              f"деление при {planner.saturation}+ объектах | В очереди: {planner.pending()}")
+        return planner
+
+    def _build_zone_url(self, lon: float, lat: float, zoom: int) -> str:
+        """URL поиска парковок с центром карты в точке"""
+        raise NotImplementedError
+
+    def generate_grid_z14(self) -> List[Dict[str, Any]]:
+        """Фиксированная сетка зон z=14"""
+        raise NotImplementedError
+
+    def _start_zone(self):
+        """Начало подсчета выдачи зоны"""
+        if self.search_collector:
+            # Поздние ответы прошлой зоны: в очередь, но не в выдачу новой зоны
+            self._add_urls(item['url'] for item in self.search_collector.drain())
+        self._zone_urls = set()
+
+    def _finish_zone(self, planner: ZonePlanner, area: Dict[str, Any], new_urls: int) -> int:
+        """
+        Завершение зоны: отметка в журнале и передача размера выдачи планировщику
+
+        Returns:
+            Сколько объектов было в выдаче зоны
+        """
+        found = len(self._zone_urls or ())
+        self._zone_urls = None
+        self._mark_zone_done(area, new_urls)
+        planner.report(area, found)
+        return found
+
+    def _abandon_zone(self, area: Dict[str, Any]):
+        """Зона зависла: не отмечается пройденной, браузер перезапускается"""
+        self._zone_urls = None
+        print(f"   ⚠ Зона {area['name']} не пройдена до конца (повторится при --resume)")
+        self.browser_manager.request_recycle("зависла страница зоны")
+
+    def _is_zone_done(self, area: Dict[str, Any]) -> bool:
+        """Зона уже пройдена в продолжаемом прогоне"""
+        return area['url'] in self._done_zones
+
+    def _mark_zone_done(self, area: Dict[str, Any], urls_found: int):
+        """Отметка зоны как пройденной в журнале"""
+        self._done_zones.add(area['url'])
+        if self.journal:
+            self.journal.mark_zone_done(area['url'], urls_found)
+
     async def close(self):
         """Закрытие браузера"""
         print("\n🔄 Завершаем работу парсера...")
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        if self.html_cache:
+            self.html_cache.close()
+            self.html_cache = None
         if self.browser:
-            try:
-                self.browser = None
-                print("✅ Ресурсы освобождены")
-            except Exception as e:
-                print(f"⚠️ Ошибка при закрытии: {e}")
-                self.browser = None
+            await self.browser_manager.stop(self.browser)
+            self.browser = None
+            print("✅ Ресурсы освобождены")
 
     # === ОБЩИЕ ВСПОМОГАТЕЛЬНЫЕ МЕТОДЫ ===
 
@@ -127,72 +401,611 @@ class BaseParser(ABC):
 
     def _is_loading_element_visible(self, soup: BeautifulSoup) -> bool:
         """Проверка видимости элементов загрузки"""
-        loading_selectors = [
-            '.spin2', '.spinner', '.loading', '.loader',
-            '[class*="loading"]', '[class*="spinner"]'
-        ]
-
-        for selector in loading_selectors:
+        for selector in self.loading_selectors:
             if soup.select_one(selector):
                 return True
         return False
 
-    # === МЕТОДЫ ПАРСИНГА СТРАНИЦ ОБЪЕКТОВ ===
-
-    async def _parse_all_parking_pages(self, urls: List[str]) -> None:
-        """Общий метод парсинга всех страниц объектов"""
-        print(f"\n🏢 Начинаем парсинг {len(urls)} объектов из {self.source_name}...")
+    def _ready_selectors(self, kind: str) -> List[str]:
+        """Селекторы готовности страницы вида kind ('detail', 'zone', ...)"""
+        source_config = Config.YANDEX if self.source_name == 'yandex' else Config.TWOGIS
+        return source_config['ready_selectors'].get(kind, [])
+
+    async def _wait_for_ready(self, tab, selectors: List[str], timeout: Optional[float] = None,
+                              kind: str = 'detail') -> bool:
+        """
+        Ожидание готовности страницы вместо фиксированной паузы: в DOM есть хотя бы
+        один из selectors и не видно элементов загрузки (loading_selectors).
+
+        Args:
+            tab: Вкладка браузера
+            selectors: Селекторы содержимого страницы
+            timeout: Максимальное ожидание (сек), по умолчанию Config.CRAWL['ready_timeout']
+            kind: Вид страницы для статистики времени готовности
+
+        Returns:
+            True, если содержимое появилось (даже если спиннер не исчез до таймаута)
+        """
+        timeout = timeout or Config.CRAWL['ready_timeout']
+        script = f"""
+            (function(ready, loading) {{
+                const found = ready.some((selector) => document.querySelector(selector));
+                const spinning = loading.some((selector) =>
+                    Array.from(document.querySelectorAll(selector)).some((el) => el.offsetParent !== null));
+                return found ? (spinning ? 'loading' : 'ready') : 'empty';
+            }})({json.dumps(selectors)}, {json.dumps(self.loading_selectors)})
+        """
+
+        start = time.time()
+        state = 'empty'
+        while True:
+            try:
+                state = await self._with_timeout(tab.evaluate(script), 'evaluate')
+            except Exception:
+                state = 'empty'
+
+            elapsed = time.time() - start
+            if state == 'ready':
+                self._ready_times.setdefault(kind, []).append(elapsed)
+                # Короткая пауза, чтобы дорисовались соседние блоки
+                await asyncio.sleep(Config.CRAWL['ready_settle'])
+                return True
+            if elapsed >= timeout:
+                break
+            await asyncio.sleep(Config.CRAWL['ready_poll_interval'])
+
+        self._ready_timeouts[kind] = self._ready_timeouts.get(kind, 0) + 1
+        print(f"   ⏳ Страница не готова за {timeout:.0f}с ({kind})")
+        return state == 'loading'
+
+    @staticmethod
+    def _percentile(values: List[float], q: float) -> float:
+        """Перцентиль q (0-100) списка значений"""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
 
-        success_count = 0
-        fail_count = 0
+    # === МЕТОДЫ ПАРСИНГА СТРАНИЦ ОБЪЕКТОВ ===
 
-        for i, url in enumerate(urls, 1):
-            print(f"\n[{i}/{len(urls)}] Объект {i}")
-            print(f"   🔗 {self._shorten_url(url, 60)}")
+    async def _prepare_tab(self, tab):
+        """Настройка вкладки перед навигацией (блокировка ресурсов)"""
+        if self.resource_blocker:
+            await self._with_timeout(self.resource_blocker.attach(tab), 'evaluate')
 
-            # Парсим страницу
-            data = await self._parse_single_page(url)
+    async def _attach_search_collector(self, tab):
+        """Подписка вкладки зоны на JSON-ответы поиска"""
+        if self.search_collector:
+            try:
+                await self._with_timeout(self.search_collector.attach(tab), 'evaluate')
+            except Exception as e:
+                print(f"   ⚠ Не удалось подписаться на ответы поиска: {str(e)[:50]}")
+
+    def _search_responses_seen(self) -> int:
+        """Сколько поисковых JSON-ответов уже разобрано"""
+        return self.search_collector.responses if self.search_collector else 0
+
+    async def _collect_search_results(self) -> int:
+        """Регистрация всех объектов из перехваченных ответов поиска; возвращает число новых URL"""
+        await self.search_collector.flush()
+        items = self.search_collector.drain()
+        return self._add_urls(item['url'] for item in items)
+
+    def _search_api_patterns(self) -> List[str]:
+        """Регулярные выражения URL поисковых XHR источника"""
+        return []
+
+    def _parse_search_payload(self, payload: Any) -> List[Dict[str, Any]]:
+        """Разбор JSON ответа поиска: [{'url', 'id', 'name', 'address', 'coords'}]"""
+        return []
+
+    def _result_link_pattern(self) -> str:
+        """Регулярное выражение (JS) для href ссылок на объекты в выдаче (пусто - не собирать)"""
+        return ''
+
+    async def _open_url(self, url: str, tab=None):
+        """
+        Переход по URL с учетом лимита запросов к хосту
+
+        Args:
+            url: Адрес страницы
+            tab: Вкладка (None - основная вкладка браузера)
+
+        Returns:
+            Вкладка со страницей
+        """
+        state = _page_state.get()
+        if state is None:
+            await self.rate_limiter.acquire(url)
+        else:
+            # Очередь к общему лимиту хоста не считается временем загрузки страницы
+            state['waiting_since'] = time.monotonic()
+            try:
+                await self.rate_limiter.acquire(url)
+            finally:
+                state['limiter_wait'] += time.monotonic() - state['waiting_since']
+                state['waiting_since'] = None
+        self.browser_manager.page_loaded()
+        if tab is None:
+            return await self._with_timeout(self.browser.get(url), 'navigation')
+        await self._with_timeout(tab.get(url), 'navigation')
+        return tab
+
+    async def _open_tab(self):
+        """Открытие новой вкладки для воркера"""
+        if self.browser is None:
+            raise RuntimeError("браузер не запущен")
+        tab = await self._with_timeout(self.browser.get('about:blank', new_tab=True), 'navigation')
+        await self._prepare_tab(tab)
+        return tab
+
+    def _add_urls(self, urls) -> int:
+        """Регистрация найденных URL; новые сразу попадают в очередь парсинга объектов"""
+        new_urls = []
+        for url in urls:
+            if not url:
+                continue
+            if self._zone_urls is not None:
+                self._zone_urls.add(url)
+            if url in self.all_urls:
+                continue
+
+            self.all_urls.add(url)
+            new_urls.append(url)
+
+            if self._url_queue is not None:
+                self._url_queue.put_nowait(url)
+                self._progress['total'] += 1
+
+        if new_urls and self.journal:
+            self.journal.add_urls(new_urls)
+
+        return len(new_urls)
 
-            if data:
-                normalized_data = self.normalize_data(data)
-                self.results.append(normalized_data)
-                success_count += 1
+    async def _parse_all_parking_pages(self, urls: List[str]) -> None:
+        """Общий метод парсинга всех страниц объектов пулом вкладок"""
+        await self._run_detail_stage(urls)
+
+    async def _run_detail_stage(self, urls: List[str], collect=None) -> None:
+        """
+        Этап парсинга объектов пулом вкладок.
+
+        Если передан collect (корутинная функция сбора URL по зонам), сбор идет
+        параллельно с парсингом: новые URL из _add_urls сразу попадают в очередь.
+        """
+        if collect is not None and not Config.CRAWL['pipeline']:
+            await collect()
+            urls = list(self.all_urls)
+            collect = None
+
+        print(f"\n🏢 Начинаем парсинг {len(urls)} объектов из {self.source_name} "
+              f"(вкладок: {self.concurrency}{', сбор URL продолжается' if collect else ''})...")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in urls:
+            queue.put_nowait(url)
+
+        progress = {
+            'total': len(urls),
+            'done': 0,
+            'success': 0,
+            'fail': 0,
+            'reused': 0,
+            'requeued': 0,
+            'started': time.time(),
+            'collecting': collect is not None
+        }
 
-                # Выводим краткую информацию
-                name = normalized_data.get('Название объекта', 'Без названия')[:40]
-                address = normalized_data.get('Адрес', '')[:50]
-                parking_type = normalized_data.get('Тип парковки', 'неизвестно')
+        self._url_queue = queue if collect else None
+        self._progress = progress
+
+        settings = Config.CRAWL
+        self.tuner = CrawlTuner(
+            self.concurrency,
+            settings['max_concurrency'] if settings['autotune'] else self.concurrency,
+            enabled=settings['autotune'],
+            window=settings['autotune_window'],
+            rate_step=settings['autotune_rate_step'],
+            min_rate=settings['autotune_min_rate'],
+            max_rate=settings['autotune_max_rate'],
+            decrease_above=settings['autotune_decrease_above'],
+            increase_below=settings['autotune_increase_below']
+        )
+
+        # Воркеров столько, сколько может разрешить автонастройка; вкладку воркер
+        # открывает, только когда получает место
+        worker_count = self.tuner.max_concurrency
+        workers = [
+            asyncio.create_task(self._detail_worker(worker_id, queue, progress))
+            for worker_id in range(1, worker_count + 1)
+        ]
 
-                print(f"   ✅ {name}")
-                print(f"      📍 {address}")
-                print(f"      🚗 Тип: {parking_type}")
-            else:
-                fail_count += 1
-                print(f"   ❌ Не удалось распарсить")
-
-            # Статистика прогресса
-            if i % 10 == 0 or i == len(urls):
-                progress = (i / len(urls)) * 100
-                elapsed = time.time() - self.start_time
-                estimated_total = (elapsed / max(1, i)) * len(urls)
-                remaining = max(0, estimated_total - elapsed)
-
-                print(f"\n📊 Прогресс: {i}/{len(urls)} ({progress:.1f}%)")
-                print(f"⏱ Прошло: {elapsed:.0f}с | Осталось: {remaining:.0f}с")
-                print(f"✅ Успешно: {success_count} | ❌ Ошибок: {fail_count}")
-
-            # Задержка между запросами
-            if i < len(urls):
-                delay = random.uniform(4, 7)
-                print(f"   ⏳ Задержка {delay:.1f}с...")
-                await asyncio.sleep(delay)
+        try:
+            if collect is not None:
+                await collect()
+                print(f"\n✅ Сбор URL завершен, в очереди на парсинг: {queue.qsize()}")
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            self._url_queue = None
+            progress['collecting'] = False
+
+        # Ждем обработки очереди, включая URL, возвращенные после таймаута
+        # (или завершения всех воркеров, если вкладки не открываются)
+        all_workers = asyncio.gather(*workers)
+        queue_done = asyncio.create_task(queue.join())
+        await asyncio.wait([queue_done, all_workers], return_when=asyncio.FIRST_COMPLETED)
+        queue_done.cancel()
+
+        # Сигналы завершения для каждого воркера
+        for _ in range(worker_count):
+            queue.put_nowait(None)
+
+        await all_workers
+
+        # Запасные вкладки дублирующих запросов
+        for tab, generation in self._spare_tabs:
+            if generation == self.browser_manager.generation:
+                await self._close_tab(tab)
+        self._spare_tabs = []
+        self._spare_tabs_open = 0
 
         print(f"\n🎉 Парсинг завершен!")
-        print(f"📊 Итог: Успешно {success_count}, Ошибок {fail_count}")
+        print(f"📊 Итог: Успешно {progress['success']} (из журнала {progress['reused']}), "
+              f"Ошибок {progress['fail']}, возвратов в очередь {progress['requeued']}")
+
+        not_processed = progress['total'] - progress['done']
+        if not_processed > 0:
+            print(f"⚠ Не обработано URL: {not_processed}")
+
+    async def _detail_worker(self, worker_id: int, queue: asyncio.Queue, progress: Dict[str, Any]) -> None:
+        """Воркер: парсит URL из общей очереди в собственной вкладке"""
+        manager = self.browser_manager
+        tab = None
+        tab_generation = 0  # Запуск браузера, которому принадлежит вкладка
+        tab_pages = 0
+
+        while True:
+            url = await queue.get()
+            try:
+                if url is None:
+                    break
+
+                # Свежая запись из журнала - страницу не загружаем
+                record = self._fresh_records.get(self._generate_parking_id(url))
+                if record is not None:
+                    self._report_reused_record(url, record, progress)
+                    continue
+
+                # URL, возвращенный после таймаута, ждет своей паузы
+                retry_delay = self._retry_at.pop(url, 0) - time.time()
+                if retry_delay > 0:
+                    await asyncio.sleep(retry_delay)
+
+                # Частоту запросов ограничивает общий лимит хоста (_open_url),
+                # число одновременно загружаемых страниц - автонастройка
+                async with self.tuner.slot(), manager.use():
+                    # Вкладка закрытого браузера или отработавшая свой лимит страниц заменяется
+                    if tab is not None and (tab_generation != manager.generation
+                                            or tab_pages >= Config.BROWSER['tab_max_pages']):
+                        if tab_generation == manager.generation:
+                            await self._close_tab(tab)
+                        tab = None
+
+                    if tab is None:
+                        try:
+                            tab = await self._open_tab()
+                        except Exception as e:
+                            print(f"❌ Вкладка {worker_id}: не удалось открыть ({e})")
+                            queue.put_nowait(url)
+                            return
+                        tab_generation = manager.generation
+                        tab_pages = 0
+
+                    try:
+                        data = await self._parse_with_hedge(url, tab)
+                        tab_pages += 1
+                    except asyncio.TimeoutError:
+                        # Зависшая вкладка заменяется новой, URL повторяется позже
+                        self._record_outcome(url, crawl_tuner.FAIL)
+                        await self._close_tab(tab)
+                        tab = None
+                        if self._requeue(url, queue):
+                            continue
+                        data = None
+                self._report_detail_result(worker_id, url, data, progress)
+            finally:
+                queue.task_done()
+                if url is None and tab is not None and tab_generation == manager.generation:
+                    await self._close_tab(tab)
+
+    def _hedge_delay(self, url: str) -> Optional[float]:
+        """Через сколько секунд дублировать загрузку страницы (None - не дублировать)"""
+        settings = Config.HEDGING
+        if not settings['enabled'] or self._has_cached_html(url):
+            return None
+        if len(self._page_times) < settings['min_samples']:
+            return None
+        return max(settings['min_delay'], self._percentile(list(self._page_times), settings['percentile']))
+
+    async def _parse_with_hedge(self, url: str, tab) -> Optional[Dict[str, Any]]:
+        """
+        Парсинг страницы объекта; если загрузка дольше обычного (p95), та же страница
+        запрашивается в запасной вкладке и берется первый успешный результат.
+        Для автонастройки учитывается один исход на URL - исход выигравшей загрузки.
+        """
+        delay = self._hedge_delay(url)
+        primary, primary_state = self._start_page_task(self._parse_detail_page(url, tab))
+
+        if delay is None or await self._wait_page(primary, primary_state, delay):
+            data = await self._run_page(primary, primary_state)
+            self._finish_page(url, primary_state, data)
+            return data
+
+        hedge_state = self._new_page_state()
+        primary_run = asyncio.ensure_future(self._run_page(primary, primary_state))
+        hedge = asyncio.ensure_future(self._run_hedge(url, hedge_state))
+        pending = {primary_run, hedge}
+        winner = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None and task.result():
+                        winner = task
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner is None:
+            # Ни одна загрузка не удалась: таймаут основной передается воркеру
+            if primary_run.done() and not primary_run.cancelled() and primary_run.exception():
+                raise primary_run.exception()
+            self._finish_page(url, primary_state if primary_state['outcome'] else hedge_state, None)
+            return None
+
+        if winner is hedge:
+            self._hedges['won'] += 1
+            print(f"   🏁 Запасная вкладка загрузила страницу быстрее")
+        data = winner.result()
+        self._finish_page(url, primary_state if winner is primary_run else hedge_state, data)
+        return data
+
+    def _finish_page(self, url: str, state: Dict[str, Any], data: Optional[Dict[str, Any]]):
+        """Учет исхода и времени загрузки (без ожидания лимита запросов) выбранной копии страницы"""
+        if state['outcome'] is None:
+            return  # Страница взята из кэша - загрузки не было
+        self._record_outcome(url, state['outcome'])
+        if data:
+            self._page_times.append(self._page_elapsed(state))
+
+    async def _run_hedge(self, url: str, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Дублирующая загрузка страницы в запасной вкладке (с учетом лимита запросов хоста)"""
+        manager = self.browser_manager
+        spare = None
+        while self._spare_tabs:
+            tab, generation = self._spare_tabs.pop()
+            if generation == manager.generation:
+                spare = tab
+                break
+            self._spare_tabs_open -= 1
+
+        if spare is None:
+            if self._spare_tabs_open >= Config.HEDGING['spare_tabs']:
+                return None  # Все запасные вкладки заняты
+            self._spare_tabs_open += 1
+            try:
+                spare = await self._open_tab()
+            except Exception:
+                self._spare_tabs_open -= 1
+                return None
+
+        self._hedges['issued'] += 1
+        generation = manager.generation
+        print(f"   🪞 Дублируем медленную страницу в запасной вкладке")
+        try:
+            return await self._run_page(*self._start_page_task(self._parse_detail_page(url, spare), state))
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # Прерванная загрузка: вкладка могла зависнуть, закрываем ее
+            self._spare_tabs_open -= 1
+            await self._close_tab(spare)
+            spare = None
+            raise
+        finally:
+            if spare is not None:
+                self._spare_tabs.append((spare, generation))
+
+    def _requeue(self, url: str, queue: asyncio.Queue) -> bool:
+        """
+        Возврат URL в очередь после таймаута с растущей паузой
+
+        Returns:
+            False, если попытки исчерпаны
+        """
+        attempts = self._requeues.get(url, 0) + 1
+        if attempts > Config.TIMEOUTS['requeue_max']:
+            return False
+
+        self._requeues[url] = attempts
+        delay = Config.TIMEOUTS['requeue_backoff'] * 2 ** (attempts - 1)
+        self._retry_at[url] = time.time() + delay
+        self._progress['requeued'] += 1
+        queue.put_nowait(url)
+        print(f"   🔁 URL возвращен в очередь (попытка {attempts}), повтор не раньше чем через {delay:.0f}с")
+        return True
+
+    async def _with_timeout(self, awaitable, kind: str):
+        """
+        Ожидание операции браузера не дольше Config.TIMEOUTS[kind] секунд.
+        По истечении операция отменяется, таймаут учитывается в статистике.
+
+        Raises:
+            asyncio.TimeoutError: Операция не завершилась вовремя
+        """
+        timeout = Config.TIMEOUTS[kind]
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            self._timeouts[kind] = self._timeouts.get(kind, 0) + 1
+            print(f"   ⌛ Таймаут: {kind} дольше {timeout}с")
+            raise
+
+    @staticmethod
+    def _new_page_state() -> Dict[str, Any]:
+        """Учет одной загрузки страницы: время, ожидание лимита запросов, исход"""
+        return {'started': time.monotonic(), 'limiter_wait': 0.0, 'waiting_since': None, 'outcome': None}
+
+    def _start_page_task(self, coro, state: Optional[Dict[str, Any]] = None) -> Tuple[asyncio.Future, Dict[str, Any]]:
+        """
+        Запуск загрузки страницы объекта отдельной задачей со своим учетом:
+        _open_url внутри нее отмечает ожидание лимита запросов хоста, _record_outcome -
+        исход (в автонастройку его передает _finish_page)
+        """
+        state = state or self._new_page_state()
+        state['started'] = time.monotonic()
+        token = _page_state.set(state)
+        try:
+            task = asyncio.ensure_future(coro)
+        finally:
+            _page_state.reset(token)
+        return task, state
+
+    @staticmethod
+    def _page_elapsed(state: Dict[str, Any]) -> float:
+        """Время загрузки страницы без ожидания лимита запросов (сек)"""
+        now = time.monotonic()
+        limiter_wait = state['limiter_wait']
+        if state['waiting_since'] is not None:
+            limiter_wait += now - state['waiting_since']
+        return now - state['started'] - limiter_wait
+
+    async def _wait_page(self, task: asyncio.Future, state: Dict[str, Any], limit: float) -> bool:
+        """Ожидание загрузки не дольше limit секунд без учета ожидания лимита; True - завершилась"""
+        while not task.done():
+            remaining = limit - self._page_elapsed(state)
+            if remaining <= 0:
+                return False
+            await asyncio.wait({task}, timeout=remaining)
+        return True
+
+    async def _run_page(self, task: asyncio.Future, state: Dict[str, Any]):
+        """
+        Результат загрузки страницы с таймаутом Config.TIMEOUTS['page'];
+        время в очереди к лимиту хоста в таймаут не входит
+
+        Raises:
+            asyncio.TimeoutError: Страница не загрузилась вовремя
+        """
+        try:
+            if not await self._wait_page(task, state, Config.TIMEOUTS['page']):
+                self._timeouts['page'] = self._timeouts.get('page', 0) + 1
+                print(f"   ⌛ Таймаут: page дольше {Config.TIMEOUTS['page']}с")
+                raise asyncio.TimeoutError()
+            return task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def _close_tab(self, tab):
+        """Закрытие вкладки (ошибки и зависание игнорируются)"""
+        try:
+            await asyncio.wait_for(tab.close(), Config.TIMEOUTS['evaluate'])
+        except Exception:
+            pass
+
+    async def _parse_detail_page(self, url: str, tab) -> Optional[Dict[str, Any]]:
+        """Парсинг страницы объекта во вкладке воркера с нормализацией"""
+        data = await self._parse_single_page(url, tab)
+        return self.normalize_data(data) if data else None
+
+    def _record_outcome(self, url: str, outcome: str):
+        """Учет исхода загрузки страницы объекта для автонастройки темпа"""
+        state = _page_state.get()
+        if state is not None:
+            # Внутри загрузки страницы исход запоминается; учитывается один исход на URL
+            state['outcome'] = outcome
+            return
+        if self.tuner is None:
+            return
+        if self.tuner.bucket is None:
+            self.tuner.bucket = self.rate_limiter.bucket(url)
+        self.tuner.record(outcome)
+
+    def _report_reused_record(self, url: str, record: Dict[str, Any], progress: Dict[str, Any]) -> None:
+        """Учет записи, взятой из журнала без повторной загрузки страницы"""
+        self.results.append(record)
+        progress['done'] += 1
+        progress['success'] += 1
+        progress['reused'] += 1
+        print(f"   ♻️ [{progress['done']}/{progress['total']}] Из журнала: {self._shorten_url(url, 60)}")
+
+    def _report_detail_result(self, worker_id: int, url: str, data: Optional[Dict[str, Any]],
+                              progress: Dict[str, Any]) -> None:
+        """Учет результата страницы объекта и вывод прогресса"""
+        progress['done'] += 1
+        done = progress['done']
+        total = progress['total']
+
+        print(f"\n[{done}/{total}] Вкладка {worker_id}")
+        print(f"   🔗 {self._shorten_url(url, 60)}")
+
+        if data:
+            self.results.append(data)
+            progress['success'] += 1
+
+            if self.journal:
+                self.journal.save_record(self._generate_parking_id(url), url, data)
+
+            # Выводим краткую информацию
+            name = data.get('Название объекта', 'Без названия')[:40]
+            address = data.get('Адрес', '')[:50]
+            parking_type = data.get('Тип парковки', 'неизвестно')
+
+            print(f"   ✅ {name}")
+            print(f"      📍 {address}")
+            print(f"      🚗 Тип: {parking_type}")
+        else:
+            progress['fail'] += 1
+            print(f"   ❌ Не удалось распарсить")
+
+        # Статистика прогресса
+        if done % 10 == 0 or done == total:
+            percent = (done / max(1, total)) * 100
+            elapsed = time.time() - progress['started']
+            estimated_total = (elapsed / max(1, done)) * total
+            remaining = max(0, estimated_total - elapsed)
+
+            suffix = " (сбор URL продолжается)" if progress.get('collecting') else ""
+            print(f"\n📊 Прогресс: {done}/{total} ({percent:.1f}%){suffix}")
+            print(f"⏱ Прошло: {elapsed:.0f}с | Осталось: {remaining:.0f}с")
+            print(f"✅ Успешно: {progress['success']} | ❌ Ошибок: {progress['fail']}")
+
+            rss = self.browser_manager.rss_mb()
+            if rss is not None:
+                print(f"🧠 Память браузера: {rss:.0f} МБ | Перезапусков: {self.browser_manager.recycles}")
+
+    async def _parse_single_page(self, url: str, tab=None) -> Optional[Dict[str, Any]]:
+        """Общий метод парсинга одной страницы объекта (в переданной вкладке или основной)"""
+        try:
+            cached_html = self._get_cached_html(url)
+            if cached_html is not None:
+                data = self._extract_from_html(url, cached_html)
+                if data:
+                    print(f"   📦 Страница из кэша HTML")
+                    return data
+        except Exception as e:
+            # Ошибка кэша или разбора не должна останавливать воркера - загружаем страницу
+            print(f"   ⚠ Не удалось использовать кэш HTML: {str(e)[:50]}")
 
-    async def _parse_single_page(self, url: str) -> Optional[Dict[str, Any]]:
-        """Общий метод парсинга одной страницы объекта"""
         max_retries = 2
+        outcome = crawl_tuner.FAIL
 
         for attempt in range(1, max_retries + 1):
             try:
@@ -200,38 +1013,83 @@ class BaseParser(ABC):
                     print(f"   🔄 Повторная попытка {attempt}/{max_retries}")
                     await asyncio.sleep(random.uniform(3, 5))
 
-                # Открываем страницу в новом табе
-                tab = await self.browser.get(url)
+                # Открываем страницу во вкладке воркера
+                tab = await self._open_url(url, tab)
 
-                # Ждем загрузки
-                await asyncio.sleep(random.uniform(3, 4))
+                # Ждем готовности содержимого
+                await self._wait_for_ready(tab, self._ready_selectors('detail'))
 
                 # Получаем HTML
-                html = await tab.get_content()
-
-                # Парсим данные
-                soup = BeautifulSoup(str(html), 'lxml')
+                html = str(await self._with_timeout(tab.get_content(), 'content'))
+                self._store_html(url, html)
 
                 # Используем метод конкретного парсера
-                data = self._extract_page_data(url, soup, str(html))
-
-                # Проверяем минимальные данные
-                if data.get('Название объекта') or data.get('Адрес'):
+                data = self._extract_from_html(url, html)
+                if data:
+                    self._record_outcome(url, crawl_tuner.SUCCESS if attempt == 1 else crawl_tuner.RETRY)
                     return data
                 else:
                     print(f"   ⚠ Мало данных на странице")
+                    outcome = crawl_tuner.EMPTY
 
+            except asyncio.TimeoutError:
+                # Зависшую вкладку восстанавливает воркер
+                raise
             except Exception as e:
                 error_msg = str(e)
                 print(f"   ✗ Ошибка: {error_msg[:50]}...")
+                outcome = crawl_tuner.FAIL
 
             # Задержка перед повторной попыткой
             if attempt < max_retries:
                 retry_delay = random.uniform(5, 8)
                 await asyncio.sleep(retry_delay)
 
+        self._record_outcome(url, outcome)
         return None
 
+    def _record_from_html(self, url: str, html: str, preview_coords: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Итоговая запись объекта из HTML страницы (без браузера, например из кэша)
+
+        Args:
+            preview_coords: Координаты из поисковой выдачи, сохраненные вместе со страницей
+        """
+        data = self._extract_from_html(url, html, preview_coords)
+        return self.normalize_data(data) if data else None
+
+    def _extract_from_html(self, url: str, html: str, preview_coords: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Извлечение данных из HTML страницы объекта; None, если данных слишком мало"""
+        data = self._extract_page_data(url, PageContext(html))
+        self._apply_preview_coords(url, data, preview_coords)
+
+        # Проверяем минимальные данные
+        if data.get('Название объекта') or data.get('Адрес'):
+            return data
+        return None
+
+    def _search_preview_coords(self, url: str) -> Optional[str]:
+        """Координаты объекта из перехваченной в этом прогоне поисковой выдачи"""
+        preview = self.search_collector.items.get(url) if self.search_collector else None
+        return preview.get('coords') if preview else None
+
+    def _apply_preview_coords(self, url: str, data: Dict[str, Any], preview_coords: Optional[str] = None):
+        """
+        Координаты из поисковой выдачи, если на странице их не нашлось (у 2ГИС это
+        единственный источник): переданные, из выдачи этого прогона или из кэша HTML
+        """
+        if data.get('Координаты'):
+            return
+
+        coords = preview_coords or self._search_preview_coords(url)
+        if not coords and self.html_cache:
+            try:
+                coords = self.html_cache.get_coords(url)
+            except Exception as e:
+                print(f"   ⚠ Не удалось прочитать координаты из кэша: {str(e)[:50]}")
+        if coords:
+            data['Координаты'] = coords
+
     # === МЕТОДЫ НОРМАЛИЗАЦИИ И ОБРАБОТКИ ===
 
     def normalize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -268,6 +1126,11 @@ class BaseParser(ABC):
 
         return normalized
 
+    def _generate_parking_id(self, url: str) -> str:
+        """Генерация уникального ID объекта по URL"""
+        url_hash = hashlib.md5(url.encode()).hexdigest()[:10]
+        return f"{self.source_name}_{url_hash}"
+
     def _remove_duplicates(self):
         """Удаление дубликатов из результатов"""
         if not self.results:
@@ -299,6 +1162,32 @@ class BaseParser(ABC):
 
         self.results = unique_results
 
+    def _print_crawl_stats(self):
+        """Вывод статистики работы браузера за прогон"""
+        self.rate_limiter.print_stats()
+
+        if self.tuner:
+            self.tuner.print_stats()
+
+        if self._hedges['issued']:
+            print(f"\n🪞 ДУБЛИРУЮЩИЕ ЗАПРОСЫ: отправлено {self._hedges['issued']}, "
+                  f"выиграли {self._hedges['won']} (порог p{Config.HEDGING['percentile']}: "
+                  f"{self._percentile(list(self._page_times), Config.HEDGING['percentile']):.1f}с)")
+
+        if self._timeouts:
+            print(f"\n⌛ ТАЙМАУТЫ: " + ", ".join(f"{kind}: {count}" for kind, count in sorted(self._timeouts.items())))
+            print(f"   URL возвращено в очередь: {len(self._requeues)}")
+
+        if self.resource_blocker:
+            self.resource_blocker.print_stats()
+
+        if self._ready_times or self._ready_timeouts:
+            print(f"\n⏱ ГОТОВНОСТЬ СТРАНИЦ:")
+            for kind in sorted(set(self._ready_times) | set(self._ready_timeouts)):
+                times = self._ready_times.get(kind, [])
+                print(f"   {kind}: p50 {self._percentile(times, 50):.1f}с, p95 {self._percentile(times, 95):.1f}с "
+                      f"({len(times)} стр.), таймаутов: {self._ready_timeouts.get(kind, 0)}")
+
     def _print_final_stats(self, urls_collected: int = None):
         """Общий метод вывода финальной статистики"""
         print("\n" + "=" * 60)
@@ -357,6 +1246,6 @@ class BaseParser(ABC):
         pass
 
     @abstractmethod
-    def _extract_page_data(self, url: str, soup: BeautifulSoup, html: str) -> Dict[str, Any]:
-        """Извлечение данных со страницы объекта"""
+    def _extract_page_data(self, url: str, page: PageContext) -> Dict[str, Any]:
+        """Извлечение данных со страницы объекта (HTML разобран один раз в page)"""
         pass
@@ -0,0 +1,145 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional, Callable, Awaitable
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class BrowserManager:
+    """
+    Жизненный цикл браузера парсера: настоящая остановка процессов Chrome и
+    перезапуск после max_pages переходов или при памяти больше max_rss_mb.
+
+    Перезапуск выполняется, когда ни одна задача не работает с браузером:
+    работа со страницами оборачивается в use(), новые задачи ждут окончания перезапуска.
+    """
+
+    def __init__(self, restart: Callable[[], Awaitable[bool]], max_pages: Optional[int] = None,
+                 max_rss_mb: Optional[float] = None, rss_check_every: int = 10):
+        """
+        Args:
+            restart: Корутина перезапуска браузера (остановка и запуск заново)
+            max_pages: Перезапускать после N переходов (None - не перезапускать)
+            max_rss_mb: Перезапускать, если браузер занимает больше M МБ (нужен psutil)
+            rss_check_every: Проверять память каждые N переходов
+        """
+        self.restart = restart
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.rss_check_every = max(1, rss_check_every)
+
+        if max_rss_mb and psutil is None:
+            print(f"⚠️ psutil не установлен: перезапуск браузера по памяти ({max_rss_mb} МБ) отключен, "
+                  f"остается лимит по числу переходов (pip install psutil)")
+
+        self.pid: Optional[int] = None
+        self.generation = 0  # Номер запуска; вкладки прошлых запусков недействительны
+        self.pages = 0  # Переходов в текущем запуске
+        self.last_rss_mb: Optional[float] = None
+        self.recycles = 0
+
+        self._active = 0
+        self._recycle_due = False
+        self._condition = asyncio.Condition()
+
+    def attach(self, browser):
+        """Учет нового запущенного браузера"""
+        self.pid = getattr(browser, '_process_pid', None)
+        self.generation += 1
+        self.pages = 0
+        self._recycle_due = False
+
+    def rss_mb(self) -> Optional[float]:
+        """Память процесса браузера вместе с дочерними процессами (None без psutil)"""
+        if psutil is None or not self.pid:
+            return None
+        try:
+            process = psutil.Process(self.pid)
+            processes = [process] + process.children(recursive=True)
+            total = 0
+            for proc in processes:
+                try:
+                    total += proc.memory_info().rss
+                except psutil.Error:
+                    pass
+        except psutil.Error:
+            return None
+
+        self.last_rss_mb = total / 1024 / 1024
+        return self.last_rss_mb
+
+    def page_loaded(self):
+        """Учет перехода; при превышении лимитов браузер будет перезапущен"""
+        self.pages += 1
+        if self.max_pages and self.pages >= self.max_pages:
+            self.request_recycle(f"{self.pages} переходов")
+        elif self.max_rss_mb and self.pages % self.rss_check_every == 0:
+            rss = self.rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                self.request_recycle(f"память {rss:.0f} МБ")
+
+    def request_recycle(self, reason: str):
+        """Запрос перезапуска при ближайшей возможности"""
+        if not self._recycle_due:
+            self._recycle_due = True
+            print(f"   ♻️ Браузер будет перезапущен ({reason})")
+
+    @asynccontextmanager
+    async def use(self):
+        """Работа с браузером; на время перезапуска новые задачи ждут"""
+        async with self._condition:
+            # Перезапуск, запрошенный, когда браузером никто не пользовался
+            await self._recycle_if_idle()
+            await self._condition.wait_for(lambda: not self._recycle_due)
+            self._active += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._active -= 1
+                await self._recycle_if_idle()
+                self._condition.notify_all()
+
+    async def _recycle_if_idle(self):
+        """Перезапуск браузера, если он запрошен и браузер свободен (под self._condition)"""
+        if not self._recycle_due or self._active:
+            return
+
+        self.recycles += 1
+        print(f"   ♻️ Перезапуск браузера #{self.recycles}...")
+        if not await self.restart():
+            print(f"   ❌ Не удалось перезапустить браузер")
+        self._recycle_due = False
+
+    async def stop(self, browser):
+        """Остановка браузера с завершением всех его процессов"""
+        if browser is None:
+            return
+
+        children = []
+        if psutil is not None and self.pid:
+            try:
+                children = psutil.Process(self.pid).children(recursive=True)
+            except psutil.Error:
+                pass
+
+        try:
+            result = browser.stop()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            print(f"⚠️ Ошибка остановки браузера: {e}")
+
+        # Дочерние процессы (рендереры, GPU) могут пережить основной
+        if children:
+            gone, alive = psutil.wait_procs(children, timeout=5)
+            for proc in alive:
+                try:
+                    proc.kill()
+                except psutil.Error:
+                    pass
+
+        self.pid = None
@@ -0,0 +1,106 @@
+import re
+from typing import List, Dict, Any, Optional
+
+from .page_context import PageContext
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class FieldSpec:
+    """
+    Правила извлечения одного поля: селекторы в порядке приоритета, проверки
+    найденного текста (следующий селектор пробуется, если проверка не прошла)
+    и обработка значения первого подходящего элемента.
+    """
+
+    def __init__(self, field: str, selectors: List[str], copy_to: Optional[List[str]] = None,
+                 attr: Optional[str] = None, separator: str = '', strip: bool = False, all_matches: bool = False,
+                 min_length: int = 1, contains_any: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None, pattern: Optional[str] = None,
+                 max_length: Optional[int] = None):
+        """
+        Args:
+            field: Имя поля записи
+            selectors: CSS-селекторы в порядке приоритета
+            copy_to: Дополнительные поля с тем же значением
+            attr: Брать атрибут элемента (например, 'href') вместо текста
+            separator: Разделитель фрагментов текста элемента
+            strip: Обрезать пробелы у каждого фрагмента текста
+            all_matches: Проверять все элементы селектора, а не только первый
+            min_length: Минимальная длина значения
+            contains_any: Значение должно содержать одну из подстрок (без учета регистра)
+            exclude: Значение не должно содержать ни одну из подстрок
+            pattern: Регулярное выражение; значение - первая группа или все совпадение
+            max_length: Обрезать значение до N символов
+        """
+        self.field = field
+        self.selectors = list(selectors)
+        self.targets = [field] + list(copy_to or [])
+        self.attr = attr
+        self.separator = separator
+        self.strip = strip
+        self.all_matches = all_matches
+        self.min_length = min_length
+        self.contains_any = [word.lower() for word in contains_any or []]
+        self.exclude = list(exclude or [])
+        self.pattern = re.compile(pattern) if pattern else None
+        self.max_length = max_length
+
+    def _raw(self, elem) -> str:
+        """Текст или атрибут элемента"""
+        if self.attr:
+            return (elem.get(self.attr) or '').strip()
+        return _WHITESPACE.sub(' ', elem.get_text(self.separator, strip=self.strip)).strip()
+
+    def _valid(self, value: str) -> bool:
+        """Проверка найденного значения"""
+        if len(value) < self.min_length:
+            return False
+        if self.contains_any:
+            lower = value.lower()
+            if not any(word in lower for word in self.contains_any):
+                return False
+        return not any(word in value for word in self.exclude)
+
+    def _process(self, value: str) -> Optional[str]:
+        """Обработка значения первого подходящего элемента"""
+        if self.pattern:
+            match = self.pattern.search(value)
+            if not match:
+                return None
+            value = match.group(1) if self.pattern.groups else match.group(0)
+        if self.max_length:
+            value = value[:self.max_length]
+        return value
+
+    def extract(self, page: PageContext) -> Optional[str]:
+        """Значение поля со страницы (None, если не найдено)"""
+        for selector in self.selectors:
+            elems = page.select(selector) if self.all_matches else [page.select_one(selector)]
+            for elem in elems:
+                if elem is None:
+                    continue
+                value = self._raw(elem)
+                if self._valid(value):
+                    return self._process(value)
+        return None
+
+
+class ExtractionSpec:
+    """Набор правил извлечения полей источника; компилируется один раз при импорте парсера"""
+
+    def __init__(self, fields: List[Dict[str, Any]]):
+        """
+        Args:
+            fields: Описания полей (аргументы FieldSpec), например из Config.YANDEX['fields']
+        """
+        self.fields = [FieldSpec(**field) for field in fields]
+
+    def extract(self, page: PageContext, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Заполнение найденных полей записи data"""
+        for spec in self.fields:
+            value = spec.extract(page)
+            if value:
+                for target in spec.targets:
+                    data[target] = value
+        return data
@@ -0,0 +1,85 @@
+import json
+from typing import List, Optional
+
+# При первом вызове на странице скрипт собирает уже имеющиеся ссылки и ставит
+# MutationObserver; каждый вызов возвращает только ссылки, появившиеся с прошлого вызова
+_HARVEST_SCRIPT = """
+(function(pattern) {
+    let harvester = window.__linkHarvester;
+    if (!harvester) {
+        const re = new RegExp(pattern);
+        harvester = window.__linkHarvester = { seen: new Set(), delta: [] };
+
+        const take = (link) => {
+            const href = link.getAttribute('href');
+            if (href && re.test(href) && !harvester.seen.has(href)) {
+                harvester.seen.add(href);
+                harvester.delta.push(href);
+            }
+        };
+        const scan = (node) => {
+            if (node.nodeType !== 1) return;
+            if (node.tagName === 'A') take(node);
+            node.querySelectorAll('a[href]').forEach(take);
+        };
+
+        scan(document.documentElement);
+        new MutationObserver((mutations) => {
+            for (const mutation of mutations) {
+                if (mutation.type === 'attributes') {
+                    if (mutation.target.tagName === 'A') take(mutation.target);
+                } else {
+                    mutation.addedNodes.forEach(scan);
+                }
+            }
+        }).observe(document.documentElement, {
+            childList: true, subtree: true, attributes: true, attributeFilter: ['href']
+        });
+    }
+
+    const delta = harvester.delta;
+    harvester.delta = [];
+    return JSON.stringify(delta);
+})(%s)
+"""
+
+
+class LinkHarvester:
+    """
+    Сбор ссылок выдачи прямо в странице: наблюдатель DOM копит новые href,
+    а Python забирает только прирост с прошлого опроса вместо всего outerHTML.
+    """
+
+    def __init__(self, href_pattern: str):
+        """
+        Args:
+            href_pattern: Регулярное выражение (JS) для атрибута href нужных ссылок
+        """
+        self.href_pattern = href_pattern
+        self._script = _HARVEST_SCRIPT % json.dumps(href_pattern)
+
+        self.polls = 0  # Опросов страницы
+        self.links = 0  # Получено ссылок
+
+    async def poll(self, tab) -> Optional[List[str]]:
+        """
+        Ссылки, появившиеся в странице с прошлого опроса.
+        После перехода на новую страницу наблюдатель ставится заново и
+        первый опрос возвращает все ссылки, уже присутствующие в DOM.
+
+        Returns:
+            Список href или None, если скрипт выполнить не удалось
+        """
+        try:
+            raw = await tab.evaluate(self._script)
+            links = json.loads(raw) if isinstance(raw, str) else None
+        except Exception as e:
+            print(f"   ⚠ Не удалось получить ссылки из страницы: {str(e)[:50]}")
+            return None
+
+        if links is None:
+            return None
+
+        self.polls += 1
+        self.links += len(links)
+        return links
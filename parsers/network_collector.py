@@ -0,0 +1,96 @@
+import asyncio
+import base64
+import json
+import re
+from typing import List, Dict, Any, Callable, Set
+
+from nodriver import cdp
+
+
+class SearchResponseCollector:
+    """Сбор результатов поиска из JSON-ответов сайта (CDP Network) вместо разбора DOM"""
+
+    def __init__(self, url_patterns: List[str], parse_payload: Callable[[Any], List[Dict[str, Any]]]):
+        """
+        Args:
+            url_patterns: Регулярные выражения URL поисковых XHR
+            parse_payload: Функция разбора JSON ответа в список объектов
+                (словари с ключами 'url', 'id', 'name', 'address', 'coords')
+        """
+        self.url_patterns = [re.compile(pattern) for pattern in url_patterns]
+        self.parse_payload = parse_payload
+
+        self.responses = 0  # Разобранных поисковых ответов
+        self.items: Dict[str, Dict[str, Any]] = {}  # url -> объект из поисковой выдачи
+        self._recent_items: Dict[str, Dict[str, Any]] = {}  # Объекты ответов с прошлого drain()
+        self._pending_requests: Dict[str, str] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def matches(self, url: str) -> bool:
+        """URL относится к поисковым запросам сайта"""
+        return any(pattern.search(url) for pattern in self.url_patterns)
+
+    async def attach(self, tab):
+        """Подписка на ответы сети во вкладке"""
+        if getattr(tab, '_search_collector_attached', False):
+            return
+        tab._search_collector_attached = True
+
+        def on_response_received(event: cdp.network.ResponseReceived):
+            if self.matches(event.response.url):
+                self._pending_requests[str(event.request_id)] = event.response.url
+
+        def on_loading_finished(event: cdp.network.LoadingFinished):
+            if str(event.request_id) in self._pending_requests:
+                # Тело ответа доступно только после завершения загрузки
+                task = asyncio.ensure_future(self._read_response(tab, event.request_id))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        tab.add_handler(cdp.network.ResponseReceived, on_response_received)
+        tab.add_handler(cdp.network.LoadingFinished, on_loading_finished)
+        await tab.send(cdp.network.enable())
+
+    async def _read_response(self, tab, request_id):
+        """Получение и разбор тела поискового ответа"""
+        url = self._pending_requests.pop(str(request_id), '')
+        try:
+            body, is_base64 = await tab.send(cdp.network.get_response_body(request_id=request_id))
+            if is_base64:
+                body = base64.b64decode(body).decode('utf-8')
+            self.feed(json.loads(body))
+        except Exception as e:
+            print(f"   ⚠ Не удалось разобрать ответ поиска {url[:60]}: {str(e)[:50]}")
+
+    def feed(self, payload: Any) -> int:
+        """
+        Разбор JSON ответа поиска (можно вызывать напрямую с записанными ответами)
+
+        Returns:
+            Количество объектов, не встречавшихся раньше в прогоне
+        """
+        self.responses += 1
+        new_count = 0
+        for item in self.parse_payload(payload):
+            url = item.get('url')
+            if not url:
+                continue
+            if url not in self.items:
+                new_count += 1
+            self.items[url] = item
+            self._recent_items[url] = item
+        return new_count
+
+    async def flush(self):
+        """Ожидание разбора уже полученных ответов"""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """
+        Все объекты из ответов, разобранных с прошлого вызова, включая уже встречавшиеся
+        в прогоне (выдача зоны считается целиком; повторы отсекаются при постановке в очередь)
+        """
+        items = list(self._recent_items.values())
+        self._recent_items = {}
+        return items
@@ -0,0 +1,83 @@
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+
+class PageContext:
+    """
+    Страница объекта для извлечения полей: HTML разбирается один раз, текст страницы
+    и результаты селекторов вычисляются при первом обращении и переиспользуются
+    всеми извлекателями и определителями типа парковки.
+    """
+
+    def __init__(self, html: str, features: str = 'lxml'):
+        """
+        Args:
+            html: HTML страницы
+            features: Парсер BeautifulSoup ('lxml', 'html.parser')
+        """
+        self.html = html
+        self.features = features
+
+        self._soup: Optional[BeautifulSoup] = None
+        self._text: Optional[str] = None
+        self._text_lower: Optional[str] = None
+        self._raw_text: Optional[str] = None
+        self._raw_text_lower: Optional[str] = None
+        self._html_lower: Optional[str] = None
+        self._select_one: Dict[str, object] = {}
+        self._select: Dict[str, List] = {}
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Дерево разбора страницы"""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, self.features)
+        return self._soup
+
+    @property
+    def text(self) -> str:
+        """Видимый текст страницы (фрагменты через пробел)"""
+        if self._text is None:
+            self._text = self.soup.get_text(' ', strip=True)
+        return self._text
+
+    @property
+    def text_lower(self) -> str:
+        """Видимый текст страницы в нижнем регистре"""
+        if self._text_lower is None:
+            self._text_lower = self.text.lower()
+        return self._text_lower
+
+    @property
+    def raw_text(self) -> str:
+        """Текст страницы без разделителей между фрагментами (как soup.get_text())"""
+        if self._raw_text is None:
+            self._raw_text = self.soup.get_text()
+        return self._raw_text
+
+    @property
+    def raw_text_lower(self) -> str:
+        """Текст страницы без разделителей в нижнем регистре"""
+        if self._raw_text_lower is None:
+            self._raw_text_lower = self.raw_text.lower()
+        return self._raw_text_lower
+
+    @property
+    def html_lower(self) -> str:
+        """HTML страницы в нижнем регистре"""
+        if self._html_lower is None:
+            self._html_lower = self.html.lower()
+        return self._html_lower
+
+    def select_one(self, selector: str):
+        """Первый элемент по CSS-селектору (результат запоминается)"""
+        if selector not in self._select_one:
+            self._select_one[selector] = self.soup.select_one(selector)
+        return self._select_one[selector]
+
+    def select(self, selector: str) -> List:
+        """Все элементы по CSS-селектору (результат запоминается)"""
+        if selector not in self._select:
+            self._select[selector] = self.soup.select(selector)
+        return self._select[selector]
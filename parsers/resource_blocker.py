@@ -0,0 +1,85 @@
+from collections import Counter
+from typing import List, Dict
+
+from nodriver import cdp
+
+
+class ResourceBlocker:
+    """Блокировка ненужных ресурсов (картинки, шрифты, медиа, аналитика) через CDP Fetch"""
+
+    def __init__(self, resource_types: List[str], url_patterns: List[str], avg_bytes: Dict[str, int]):
+        """
+        Args:
+            resource_types: Типы ресурсов CDP для блокировки ('Image', 'Font', 'Media', ...)
+            url_patterns: Шаблоны URL для блокировки (wildcard '*' в формате Fetch.RequestPattern)
+            avg_bytes: Средний размер ресурса по типу для оценки сэкономленного трафика
+        """
+        self.resource_types = resource_types
+        self.url_patterns = url_patterns
+        self.avg_bytes = avg_bytes
+
+        self.blocked_by_type: Counter = Counter()
+        self.received_bytes = 0
+
+    def _request_patterns(self) -> List[cdp.fetch.RequestPattern]:
+        """Шаблоны запросов, которые перехватываются и отклоняются"""
+        patterns = [
+            cdp.fetch.RequestPattern(
+                url_pattern='*',
+                resource_type=cdp.network.ResourceType(resource_type),
+                request_stage=cdp.fetch.RequestStage.REQUEST
+            )
+            for resource_type in self.resource_types
+        ]
+        patterns.extend(
+            cdp.fetch.RequestPattern(url_pattern=pattern, request_stage=cdp.fetch.RequestStage.REQUEST)
+            for pattern in self.url_patterns
+        )
+        return patterns
+
+    async def attach(self, tab):
+        """Подключение блокировки к вкладке (повторный вызов для той же вкладки ничего не делает)"""
+        if getattr(tab, '_resource_blocker_attached', False):
+            return
+        tab._resource_blocker_attached = True
+
+        async def on_request_paused(event: cdp.fetch.RequestPaused):
+            resource_type = event.resource_type.value if event.resource_type else 'Other'
+            self.blocked_by_type[resource_type] += 1
+            try:
+                await tab.send(cdp.fetch.fail_request(
+                    request_id=event.request_id,
+                    error_reason=cdp.network.ErrorReason.BLOCKED_BY_CLIENT
+                ))
+            except Exception:
+                pass
+
+        def on_loading_finished(event: cdp.network.LoadingFinished):
+            self.received_bytes += int(event.encoded_data_length or 0)
+
+        tab.add_handler(cdp.fetch.RequestPaused, on_request_paused)
+        tab.add_handler(cdp.network.LoadingFinished, on_loading_finished)
+
+        try:
+            await tab.send(cdp.network.enable())
+            await tab.send(cdp.fetch.enable(patterns=self._request_patterns()))
+        except Exception as e:
+            print(f"   ⚠ Не удалось включить блокировку ресурсов: {str(e)[:50]}")
+
+    def estimated_saved_bytes(self) -> int:
+        """Оценка сэкономленного трафика по среднему размеру ресурсов"""
+        default = self.avg_bytes.get('Other', 0)
+        return sum(count * self.avg_bytes.get(resource_type, default)
+                   for resource_type, count in self.blocked_by_type.items())
+
+    def print_stats(self):
+        """Вывод статистики блокировки"""
+        blocked = sum(self.blocked_by_type.values())
+        saved_mb = self.estimated_saved_bytes() / 1024 / 1024
+        received_mb = self.received_bytes / 1024 / 1024
+
+        print(f"\n🚫 БЛОКИРОВКА РЕСУРСОВ:")
+        print(f"   Заблокировано запросов: {blocked} (≈{saved_mb:.1f} МБ сэкономлено)")
+        for resource_type, count in self.blocked_by_type.most_common():
+            print(f"   {resource_type}: {count}")
+        print(f"   Загружено: {received_mb:.1f} МБ")
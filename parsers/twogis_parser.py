@@ -3,22 +3,48 @@ import random
 import re
 import hashlib
 import time
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs, urlencode
 
 from bs4 import BeautifulSoup
 import nodriver
 
+from config import Config
 from .base_parser import BaseParser
+from .zone_planner import ZonePlanner
+from .page_context import PageContext
+from .field_spec import ExtractionSpec
+
+# Правила извлечения полей карточки, компилируются один раз при импорте
+FIELDS = ExtractionSpec(Config.TWOGIS['fields'])
+
+PHONE_CHARS = re.compile(r'[^\d\+\(\)\s\-]')
+PRICE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'(\d+[\s\u00A0]*руб[лей\.]*)',
+    r'(\d+[\s\u00A0]*₽)',
+    r'(\d+[\s\u00A0]*р\.)',
+    r'(\d+[\s\u00A0]*в час)',
+    r'(\d+[\s\u00A0]*в сутки)',
+    r'(\d+[\s\u00A0]*в месяц)',
+]]
+CAPACITY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'(\d+)[\s\u00A0]*мест[а-я]*',
+    r'(\d+)[\s\u00A0]*машиномест',
+    r'вместимость[\s:]*(\d+)',
+    r'(\d+)[\s\u00A0]*автомобил[ейя]',
+]]
 
 
 class TwoGisParser(BaseParser):
     """Парсер 2ГИС с разбиением на зоны."""
 
-    def __init__(self, headless: bool = True):
-        super().__init__(headless)
+    def __init__(self, headless: bool = True, concurrency: Optional[int] = None, resume: bool = False,
+                 record_ttl_hours: Optional[float] = None, cache_max_age_hours: Optional[float] = None,
+                 block_resources: Optional[bool] = None, shard: Optional[Tuple[int, int]] = None):
+        super().__init__(headless, concurrency, resume, record_ttl_hours, cache_max_age_hours, block_resources, shard)
         self.processed_ids: Set[str] = set()
+        self._zone_responses_before = 0  # Ответов поиска до открытия текущей зоны
         self.session_headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -41,41 +67,22 @@ class TwoGisParser(BaseParser):
         if not await self.init_browser():
             return []
 
+        pending_urls = self._open_journal()
+        self._open_html_cache()
+
         try:
-            # 1. Генерируем зоны для Санкт-Петербурга
+            # 1. Разбиваем Санкт-Петербург на зоны (адаптивно или фиксированной сеткой z=14)
             print(f"\n🎯 ГЕНЕРАЦИЯ ЗОН ДЛЯ САНКТ-ПЕТЕРБУРГА")
             print("-" * 50)
 
-            search_areas = self.generate_grid_z14()
-            print(f"✅ Сгенерировано зон: {len(search_areas)}")
+            planner = self._create_zone_planner()
+            print(f"✅ Зон в очереди: {planner.pending()}")
 
-            # 2. Парсим все зоны города
-            print(f"\n📄 ЭТАП 1: СБОР ВСЕХ ССЫЛОК НА ПАРКОВКИ ПО ЗОНАМ")
+            # 2-3. Собираем ссылки по зонам и параллельно парсим найденные парковки
+            print(f"\n📄 ЭТАП 1+2: СБОР ССЫЛОК ПО ЗОНАМ И ПАРСИНГ ПАРКОВОК")
             print("-" * 50)
 
-            for i, area in enumerate(search_areas, 1):
-                urls_before = len(self.all_urls)
-
-                print(f"\n📍 Зона {i}/{len(search_areas)}: {area['name']}")
-                print(f"   Координаты: {area['coords'][1]:.4f}°N, {area['coords'][0]:.4f}°E")
-                print(f"   Масштаб: z={area['zoom']}")
-                print(f"   URL: {area['url']}")
-
-                # Открываем страницу зоны
-                await self._collect_urls_from_zone(
-                    area['url'],
-                    area['name'],
-                    area['coords'],
-                    area['zoom']
-                )
-
-                new_urls = len(self.all_urls) - urls_before
-                print(f"✅ В зоне найдено парковок: {new_urls}")
-                print(f"📊 Всего собрано ссылок: {len(self.all_urls)}")
-
-                # Пауза между зонами
-                if i < len(search_areas):
-                    await asyncio.sleep(random.uniform(5, 8))
+            await self._run_detail_stage(pending_urls, collect=lambda: self._collect_all_zones(planner))
 
             if not self.all_urls:
                 print("❌ Не удалось собрать ссылки на парковки")
@@ -83,16 +90,10 @@ class TwoGisParser(BaseParser):
 
             print(f"\n✅ Всего собрано уникальных ссылок: {len(self.all_urls)}")
 
-            # 3. Парсим все собранные парковки
-            print("\n🏢 ЭТАП 2: ПАРСИНГ ВСЕХ СОБРАННЫХ ПАРКОВОК")
-            print("-" * 50)
-
-            urls_list = list(self.all_urls)
-            await self._parse_all_parking_pages(urls_list)
-
             # 4. Удаляем дубликаты и выводим статистику
             self._remove_duplicates()
             self._print_final_stats(len(self.all_urls))
+            self._print_crawl_stats()
 
             return self.results
 
@@ -104,14 +105,53 @@ class TwoGisParser(BaseParser):
         finally:
             await self.close()
 
+    async def _collect_all_zones(self, planner: ZonePlanner):
+        """Этап 1: сбор ссылок на парковки по всем зонам города"""
+        for i, area in enumerate(planner, 1):
+            if self._is_zone_done(area):
+                print(f"\n⏭ Зона {i} (+{planner.pending()}): {area['name']} уже пройдена")
+                continue
+
+            urls_before = len(self.all_urls)
+
+            print(f"\n📍 Зона {i} (+{planner.pending()} в очереди): {area['name']}")
+            print(f"   Координаты: {area['coords'][1]:.4f}°N, {area['coords'][0]:.4f}°E")
+            print(f"   Масштаб: z={area['zoom']}")
+            print(f"   URL: {area['url']}")
+
+            # Открываем страницу зоны
+            self._start_zone()
+            try:
+                async with self.browser_manager.use():
+                    await self._with_timeout(self._collect_urls_from_zone(
+                        area['url'],
+                        area['name'],
+                        area['coords'],
+                        area['zoom']
+                    ), 'zone')
+            except asyncio.TimeoutError:
+                self._abandon_zone(area)
+                continue
+
+            new_urls = len(self.all_urls) - urls_before
+            found = self._finish_zone(planner, area, new_urls)
+            print(f"✅ В зоне найдено парковок: {found} (новых: {new_urls})")
+            print(f"📊 Всего собрано ссылок: {len(self.all_urls)}")
+
+        planner.print_stats()
+
+    def _build_zone_url(self, lon: float, lat: float, zoom: int) -> str:
+        """URL поиска парковок с центром карты в точке"""
+        # 2GIS использует параметры m для позиционирования: lon,lat,zoom
+        return f"https://2gis.ru/spb/search/parking/?m={lon:.6f}%2C{lat:.6f}%2F{zoom}"
+
     def generate_grid_z14(self) -> List[Dict[str, Any]]:
         """
         Автоматически генерирует сетку зон для парсинга (z=14).
         Возвращает список URL для поиска, покрывающих весь Санкт-Петербург.
         """
-        # Границы Санкт-Петербурга для 2GIS
-        LAT_MIN, LAT_MAX = 59.85, 60.05  # Немного расширяем для полного охвата
-        LON_MIN, LON_MAX = 30.15, 30.70  # Запад-Восток
+        # Границы Санкт-Петербурга для 2GIS (немного расширены для полного охвата)
+        LAT_MIN, LAT_MAX, LON_MIN, LON_MAX = self.city_bbox
 
         # Шаг сетки для z=14
         LAT_STEP = 0.04  # ~4.4 км
@@ -126,13 +166,9 @@ class TwoGisParser(BaseParser):
         while lat < LAT_MAX:
             lon = LON_MIN
             while lon < LON_MAX:
-                # Формируем URL для поиска парковок в этой зоне
-                # 2GIS использует параметры m для позиционирования: lon,lat,zoom
-                url = f"https://2gis.ru/spb/search/parking/?m={lon:.6f}%2C{lat:.6f}%2F{ZOOM}"
-
                 zones.append({
                     "name": f"Зона {zone_counter}",
-                    "url": url,
+                    "url": self._build_zone_url(lon, lat, ZOOM),
                     "coords": (lon, lat),
                     "zoom": ZOOM
                 })
@@ -153,8 +189,11 @@ class TwoGisParser(BaseParser):
             print(f"   🔍 Начинаем сбор ссылок в зоне: {zone_name}")
 
             # Открываем страницу зоны
-            tab = await self.browser.get(zone_url)
-            await asyncio.sleep(random.uniform(4, 6))
+            self._zone_responses_before = self._search_responses_seen()
+            tab = await self._open_url(zone_url)
+            await self._prepare_tab(tab)
+            await self._attach_search_collector(tab)
+            await self._wait_for_ready(tab, self._ready_selectors('zone'), kind='zone')
 
             # Кликаем по поисковой выдаче, если есть
             await self._click_search_results_if_needed(tab)
@@ -163,7 +202,7 @@ class TwoGisParser(BaseParser):
             print("   📥 Собираем ссылки с первой страницы...")
             initial_urls = await self._get_urls_from_current_page(tab)
             if initial_urls:
-                self.all_urls.update(initial_urls)
+                self._add_urls(initial_urls)
                 print(f"   📊 Первая страница: {len(initial_urls)} URL")
             else:
                 print("   ⚠ Не удалось получить ссылки с первой страницы")
@@ -175,9 +214,7 @@ class TwoGisParser(BaseParser):
             # Собираем ВСЕ URL после прокрутки
             current_urls = await self._get_urls_from_current_page(tab)
             if current_urls:
-                previous_count = len(self.all_urls)
-                self.all_urls.update(current_urls)
-                new_urls = len(self.all_urls) - previous_count
+                new_urls = self._add_urls(current_urls)
                 print(f"   📎 Всего URL после прокрутки: {len(self.all_urls)} (+{new_urls} новых)")
 
             # Пробуем найти кнопку пагинации (передаем параметры зоны)
@@ -192,6 +229,9 @@ class TwoGisParser(BaseParser):
             print(f"   ✅ Сбор ссылок в зоне {zone_name} завершен")
             return True
 
+        except asyncio.TimeoutError:
+            # Зависшую зону обрабатывает цикл по зонам
+            raise
         except Exception as e:
             print(f"   ❌ Ошибка сбора в зоне {zone_name}: {str(e)[:100]}")
             return False
@@ -213,17 +253,17 @@ class TwoGisParser(BaseParser):
             ]
 
             for selector in selectors:
-                element = await tab.query_selector(selector)
+                element = await self._with_timeout(tab.query_selector(selector), 'evaluate')
                 if element:
                     print("   🖱 Найден контейнер результатов, кликаем...")
-                    await element.click()
+                    await self._with_timeout(element.click(), 'evaluate')
                     await asyncio.sleep(2)
                     break
 
             # Также пробуем кликнуть по первой карточке
-            first_card = await tab.query_selector('.minicard')
+            first_card = await self._with_timeout(tab.query_selector('.minicard'), 'evaluate')
             if first_card:
-                await first_card.click()
+                await self._with_timeout(first_card.click(), 'evaluate')
                 await asyncio.sleep(1)
 
         except Exception as e:
@@ -235,7 +275,7 @@ class TwoGisParser(BaseParser):
 
         try:
             # 1. Сначала пробуем прокрутить основной контейнер с результатами
-            await tab.evaluate("""
+            await self._with_timeout(tab.evaluate("""
                 (function() {
                     const mainContainers = [
                         '.searchResults__list',
@@ -254,25 +294,25 @@ class TwoGisParser(BaseParser):
                     }
                     return { scrolled: false };
                 })()
-            """)
+            """), 'evaluate')
             await asyncio.sleep(random.uniform(1, 2))
 
             # 2. Прокручиваем окно браузера
-            await tab.evaluate("""
+            await self._with_timeout(tab.evaluate("""
                 window.scrollBy({
                     top: 800,
                     behavior: 'smooth'
                 });
-            """)
+            """), 'evaluate')
             await asyncio.sleep(random.uniform(1, 2))
 
             # 3. Прокручиваем все скроллируемые контейнеры
-            container_count = await tab.evaluate("""
+            container_count = await self._with_timeout(tab.evaluate("""
                 document.querySelectorAll('[data-scroll], [tabindex], [overflow="auto"], [overflow="scroll"]').length
-            """)
+            """), 'evaluate')
 
             for i in range(container_count):
-                await tab.evaluate(f"""
+                await self._with_timeout(tab.evaluate(f"""
                     (function() {{
                         const containers = document.querySelectorAll('[data-scroll], [tabindex], [overflow="auto"], [overflow="scroll"]');
                         if (containers[{i}]) {{
@@ -282,7 +322,7 @@ class TwoGisParser(BaseParser):
                             }}
                         }}
                     }})()
-                """)
+                """), 'evaluate')
                 await asyncio.sleep(0.3)
 
             await asyncio.sleep(random.uniform(2, 3))
@@ -293,7 +333,7 @@ class TwoGisParser(BaseParser):
     async def _try_find_2gis_pagination_after_scroll(self, tab, coords: tuple, zoom: int, current_page: int = 1):
         """Попытка найти кнопки пагинации после прокрутки с сохранением параметров зоны"""
         try:
-            html = await tab.get_content()
+            html = await self._with_timeout(tab.get_content(), 'content')
             soup = BeautifulSoup(html, 'lxml')
 
             next_page_num = current_page + 1
@@ -338,8 +378,8 @@ class TwoGisParser(BaseParser):
                             print(f"   📍 URL с параметрами зоны: {page_url}")
 
                             # Переходим на следующую страницу
-                            await tab.get(page_url)
-                            await asyncio.sleep(random.uniform(4, 6))
+                            await self._open_url(page_url, tab)
+                            await self._wait_for_ready(tab, self._ready_selectors('zone'), kind='zone')
 
                             # Прокручиваем новую страницу
                             await self._scroll_2gis_to_bottom(tab)
@@ -347,9 +387,7 @@ class TwoGisParser(BaseParser):
                             # Собираем URL с новой страницы
                             urls_page = await self._get_urls_from_current_page(tab)
                             if urls_page:
-                                before = len(self.all_urls)
-                                self.all_urls.update(urls_page)
-                                new_count = len(self.all_urls) - before
+                                new_count = self._add_urls(urls_page)
                                 print(f"   📊 +{new_count} новых URL")
 
                             # Рекурсивно ищем следующую страницу
@@ -384,11 +422,11 @@ class TwoGisParser(BaseParser):
 
                     for page_url in formats_to_try:
                         try:
-                            await tab.get(page_url)
-                            await asyncio.sleep(random.uniform(4, 6))
+                            await self._open_url(page_url, tab)
+                            await self._wait_for_ready(tab, self._ready_selectors('zone'), kind='zone')
 
                             # Проверяем, загрузилась ли страница
-                            current_url = await tab.evaluate("window.location.href")
+                            current_url = await self._with_timeout(tab.evaluate("window.location.href"), 'evaluate')
                             if "parking" in current_url:
                                 print(f"   ✅ Успешно перешли на страницу {next_page_num}")
 
@@ -398,9 +436,7 @@ class TwoGisParser(BaseParser):
                                 # Собираем URL с новой страницы
                                 urls_page = await self._get_urls_from_current_page(tab)
                                 if urls_page:
-                                    before = len(self.all_urls)
-                                    self.all_urls.update(urls_page)
-                                    new_count = len(self.all_urls) - before
+                                    new_count = self._add_urls(urls_page)
                                     print(f"   📊 +{new_count} новых URL")
 
                                 # Рекурсивно ищем следующую страницу
@@ -430,9 +466,17 @@ class TwoGisParser(BaseParser):
         """Получение URL парковок с текущей страницы (2ГИС)"""
         try:
             await asyncio.sleep(1)
-            html = await tab.get_content()
 
-            urls = self._extract_2gis_urls_from_html(html)
+            # Выдача из JSON-ответов поиска, если сайт их отдает в этой зоне
+            if self._search_responses_seen() > self._zone_responses_before:
+                await self.search_collector.flush()
+                return {item['url'] for item in self.search_collector.drain()}
+
+            # Прирост ссылок от наблюдателя DOM, иначе разбор всего HTML
+            urls = await self._with_timeout(self.link_harvester.poll(tab), 'evaluate') if self.link_harvester else None
+            if urls is None:
+                html = await self._with_timeout(tab.get_content(), 'content')
+                urls = self._extract_2gis_urls_from_html(html)
 
             filtered_urls = set()
             for url in urls:
@@ -447,6 +491,42 @@ class TwoGisParser(BaseParser):
             print(f"   ❌ Ошибка при извлечении URL: {str(e)[:50]}")
             return set()
 
+    def _result_link_pattern(self) -> str:
+        """href карточек выдачи 2ГИС"""
+        return Config.TWOGIS['result_link_pattern']
+
+    def _search_api_patterns(self) -> List[str]:
+        """URL поисковых XHR 2ГИС"""
+        return Config.TWOGIS['search_api_patterns']
+
+    def _parse_search_payload(self, payload: Any) -> List[Dict[str, Any]]:
+        """Разбор JSON ответа поиска 2ГИС (catalog API)"""
+        result = payload.get('result') if isinstance(payload, dict) else None
+        raw_items = result.get('items') if isinstance(result, dict) else None
+
+        items = []
+        for item in raw_items or []:
+            if not isinstance(item, dict):
+                continue
+
+            # ID филиала имеет вид "<firm_id>_<hash>"
+            firm_id = str(item.get('id') or '').split('_')[0]
+            if not firm_id.isdigit() or item.get('type', 'branch') != 'branch':
+                continue
+
+            point = item.get('point') or {}
+            coords = f"{point['lat']},{point['lon']}" if 'lat' in point and 'lon' in point else ''
+
+            items.append({
+                'url': f"https://2gis.ru/spb/firm/{firm_id}",
+                'id': firm_id,
+                'name': item.get('name', ''),
+                'address': item.get('address_name') or item.get('full_address_name', ''),
+                'coords': coords
+            })
+
+        return items
+
     def _extract_2gis_urls_from_html(self, html: str) -> List[str]:
         """Извлечение URL парковок из HTML страницы поиска (2ГИС)"""
         soup = BeautifulSoup(html, 'lxml')
@@ -542,7 +622,7 @@ class TwoGisParser(BaseParser):
 
         return url
 
-    def _extract_page_data(self, url: str, soup: BeautifulSoup, html: str) -> Dict[str, Any]:
+    def _extract_page_data(self, url: str, page: PageContext) -> Dict[str, Any]:
         """Извлечение данных из страницы 2ГИС"""
         data = {}
 
@@ -550,39 +630,8 @@ class TwoGisParser(BaseParser):
         data['Ссылка'] = url
         data['Координаты'] = self.extract_coordinates(url) or ""
 
-        # Название
-        title_selectors = [
-            'h1',
-            '[itemprop="name"]',
-            '.firm-card__title',
-            '.business-card-title',
-            'h1[data-qa="firm-card-header-name"]'
-        ]
-
-        for selector in title_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(' ', strip=True)
-                if text and len(text) > 2:
-                    data['Название объекта'] = text
-                    break
-
-        # Адрес
-        address_selectors = [
-            'address',
-            '[itemprop="address"]',
-            '.address',
-            '.firm-card__address',
-            '[data-qa="firm-card-address"]'
-        ]
-
-        for selector in address_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(' ', strip=True)
-                if text and len(text) > 5:
-                    data['Адрес'] = text
-                    break
+        # Название, адрес, сайт, тип, время работы, рейтинг, отзывы, описание (Config.TWOGIS['fields'])
+        FIELDS.extract(page, data)
 
         # Телефоны
         phones = []
@@ -595,7 +644,7 @@ class TwoGisParser(BaseParser):
         ]
 
         for selector in phone_selectors:
-            for link in soup.select(selector):
+            for link in page.select(selector):
                 href = link.get('href', '')
                 text = link.get_text(strip=True)
 
@@ -607,124 +656,20 @@ class TwoGisParser(BaseParser):
                     continue
 
                 if phone:
-                    clean_phone = re.sub(r'[^\d\+\(\)\s\-]', '', phone)
+                    clean_phone = PHONE_CHARS.sub('', phone)
                     clean_phone = ' '.join(clean_phone.split())
                     if clean_phone and clean_phone not in phones:
                         phones.append(clean_phone)
 
         data['Телефон'] = ', '.join(phones) if phones else ""
 
-        # Сайт
-        site_selectors = [
-            'a[href^="http://"]:not([href*="2gis.ru"])',
-            'a[href^="https://"]:not([href*="2gis.ru"])',
-            '.contact__website',
-            '.website',
-            '[data-qa="website"]'
-        ]
-
-        for selector in site_selectors:
-            for link in soup.select(selector):
-                href = link.get('href', '')
-                if href and '2gis.ru' not in href:
-                    data['Сайт'] = href
-                    break
-
-        # Тип объекта
-        type_selectors = [
-            '[itemprop="category"]',
-            '.category',
-            '.firm-card__category',
-            '.business-card-category'
-        ]
-
-        for selector in type_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(strip=True)
-                if text:
-                    data['Тип объекта'] = text
-                    break
-
-        # Время работы
-        hours_selectors = [
-            '[itemprop="openingHours"]',
-            '.working-hours',
-            '.schedule',
-            '.hours',
-            '[data-qa="opening-hours"]'
-        ]
-
-        for selector in hours_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(' ', strip=True)
-                if ':' in text or 'час' in text.lower() or 'открыт' in text.lower():
-                    data['Время работы'] = text
-                    break
-
-        # Рейтинг
-        rating_selectors = [
-            '[itemprop="ratingValue"]',
-            '.rating',
-            '.business-rating-badge',
-            '[data-qa="rating"]'
-        ]
-
-        for selector in rating_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(strip=True)
-                if text:
-                    try:
-                        rating_match = re.search(r'[\d\.]+', text)
-                        if rating_match:
-                            data['Оценка'] = rating_match.group(0)
-                    except:
-                        data['Оценка'] = text
-                    break
-
-        # Количество отзывов
-        reviews_selectors = [
-            '[itemprop="reviewCount"]',
-            '.reviews-count',
-            '.review-count',
-            '[data-qa="reviews-count"]'
-        ]
-
-        for selector in reviews_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(strip=True)
-                if text:
-                    reviews_match = re.search(r'\d+', text)
-                    if reviews_match:
-                        data['Количество оценок'] = reviews_match.group(0)
-                    break
-
         # Тип парковки
-        data['Тип парковки'] = self.detect_parking_type(html, data.get('Название объекта', ''))
+        data['Тип парковки'] = self.detect_parking_type(page.text_lower, data.get('Название объекта', ''))
 
         # Цены и тарифы
-        price_text = soup.get_text(' ', strip=True)
-        price_patterns = [
-            r'(\d+[\s\u00A0]*руб[лей\.]*)',
-            r'(\d+[\s\u00A0]*₽)',
-            r'(\d+[\s\u00A0]*р\.)',
-            r'(\d+[\s\u00A0]*в час)',
-            r'(\d+[\s\u00A0]*в сутки)',
-            r'(\d+[\s\u00A0]*в месяц)',
-        ]
-
         prices = []
-        for pattern in price_patterns:
-            matches = re.findall(pattern, price_text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    price = match[0]
-                else:
-                    price = match
-
+        for pattern in PRICE_PATTERNS:
+            for price in pattern.findall(page.text):
                 if price and price not in prices:
                     prices.append(price.strip())
 
@@ -733,46 +678,22 @@ class TwoGisParser(BaseParser):
             data['Цены'] = prices[0] if prices else ""
 
         # Вместимость
-        capacity_patterns = [
-            r'(\d+)[\s\u00A0]*мест[а-я]*',
-            r'(\d+)[\s\u00A0]*машиномест',
-            r'вместимость[\s:]*(\d+)',
-            r'(\d+)[\s\u00A0]*автомобил[ейя]'
-        ]
-
-        for pattern in capacity_patterns:
-            match = re.search(pattern, price_text, re.IGNORECASE)
+        for pattern in CAPACITY_PATTERNS:
+            match = pattern.search(page.text)
             if match:
                 data['Вместимость'] = match.group(1)
                 break
 
-        # Описание
-        desc_selectors = [
-            '.firm-card__description',
-            '[itemprop="description"]',
-            '.description',
-            '.firm-description'
-        ]
-
-        for selector in desc_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(' ', strip=True)
-                if text and len(text) > 20:
-                    data['Описание'] = text[:200]
-                    break
-
         # Название парковки (дублирует название объекта)
         data['Название парковки'] = data.get('Название объекта', 'Парковка')
 
         # Дополнительная проверка на парковку
         if data['Тип парковки'] == 'неизвестно':
-            page_text = soup.get_text(' ', strip=True).lower()
             name_text = data.get('Название объекта', '').lower()
 
             parking_keywords = ['парковк', 'стоянк', 'parking', 'автостоянк', 'паркинг']
             for keyword in parking_keywords:
-                if keyword in page_text or keyword in name_text:
+                if keyword in page.text_lower or keyword in name_text:
                     data['Тип парковки'] = 'парковка'
                     break
 
@@ -795,9 +716,9 @@ class TwoGisParser(BaseParser):
 
         return None
 
-    def detect_parking_type(self, html: str, name: str = "") -> str:
-        """Определение типа парковки (2ГИС)"""
-        text = (html + " " + name).lower()
+    def detect_parking_type(self, text: str, name: str = "") -> str:
+        """Определение типа парковки (2ГИС) по тексту страницы в нижнем регистре"""
+        text = text + " " + name.lower()
         type_info = []
 
         if any(word in text for word in ['платн', 'оплат', 'тариф', 'цена', '₽', 'руб']):
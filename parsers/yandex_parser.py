@@ -7,12 +7,26 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
+from config import Config
+from core import crawl_tuner
 from .base_parser import BaseParser
+from .zone_planner import ZonePlanner
+from .page_context import PageContext
+from .field_spec import ExtractionSpec
+
+# Правила извлечения полей карточки, компилируются один раз при импорте
+FIELDS = ExtractionSpec(Config.YANDEX['fields'])
+
+PHONE_CHARS = re.compile(r'[^\d+]')
+PRICE_PATTERN = re.compile(r'(\d+\s*руб|\d+\s*₽|\d+\s*в час|\d+\s*в сутки)', re.IGNORECASE)
+CAPACITY_PATTERN = re.compile(r'(\d+)\s*мест|\bвместимость\s*(\d+)', re.IGNORECASE)
 
 
 class YandexParser(BaseParser):
     """Парсер Яндекс Карт для поиска парковок в Санкт-Петербурге"""
 
+    city_bbox = (59.90, 60.05, 30.20, 30.70)
+
     @property
     def source_name(self) -> str:
         return "yandex"
@@ -31,41 +45,16 @@ class YandexParser(BaseParser):
         if not await self.init_browser():
             return []
 
-        try:
-            # Используем автоматическую сетку вместо ручного списка
-            search_areas = self.generate_grid_z14()
-
-            # 1. Парсим все области города
-            print(f"\n🎯 НАЧИНАЕМ ПАРСИНГ {len(search_areas)} АВТОЗОН (z=14)...")
-
-            for i, area in enumerate(search_areas, 1):
-                urls_before = len(self.all_urls)
-
-                print(f"\n📍 Зона {i}/{len(search_areas)}: {area['name']}")
-                print(f"   Координаты: {area['coords'][1]:.4f}°N, {area['coords'][0]:.4f}°E")
-                print(f"   URL: {area['url']}")
-
-                page = await self.browser.get(area['url'])
-                await asyncio.sleep(4)
+        pending_urls = self._open_journal()
+        self._open_html_cache()
 
-                # Кликаем кнопку "Показать результаты", если есть
-                button = await page.query_selector('span.search-command-view__show-results-button')
-                if button:
-                    print("✅ Кнопка найдена, кликаем...")
-                    await button.click()
-                    await asyncio.sleep(3)
-                    print("✅ Результаты загружены")
-
-                # Скрапим эту область
-                await self._scroll_and_collect_urls(page)
-
-                new_urls = len(self.all_urls) - urls_before
-                print(f"✅ В области найдено парковок: {new_urls}")
-                print(f"\n✅ Всего собрано ссылок на парковки: {len(self.all_urls)}")
+        try:
+            # Адаптивное разбиение города на зоны (или фиксированная сетка z=14)
+            planner = self._create_zone_planner()
 
-                # Пауза между областями
-                if i < len(search_areas):
-                    await asyncio.sleep(random.uniform(5, 8))
+            # 1-2. Собираем ссылки по областям и параллельно парсим найденные парковки
+            print(f"\n🎯 НАЧИНАЕМ ПАРСИНГ АВТОЗОН ({planner.pending()} в очереди)...")
+            await self._run_detail_stage(pending_urls, collect=lambda: self._collect_all_zones(planner))
 
             if not self.all_urls:
                 print("❌ Не удалось собрать ссылки")
@@ -73,28 +62,12 @@ class YandexParser(BaseParser):
 
             print(f"\n✅ Всего собрано ссылок на парковки: {len(self.all_urls)}")
 
-            # 2. Парсим каждую парковку
-            print("\n🏢 ПАРСИМ ДАННЫЕ ПАРКОВОК...")
-            urls_list = list(self.all_urls)
-
-            for i, url in enumerate(urls_list, 1):
-                print(f"   {i}/{len(urls_list)}: {url}")
-                data = await self.parse_parking_page(url)
-                if data:
-                    self.results.append(data)
-                    print(f"      ✅ Получены данные: {data.get('Название парковки', 'Без названия')}")
-                else:
-                    print(f"      ⚠ Не удалось получить данные")
-
-                # Задержка между запросами
-                if i < len(urls_list):
-                    await asyncio.sleep(random.uniform(3, 5))
-
             # 3. Удаляем дубликаты
             self._remove_duplicates()
 
             # 4. Выводим статистику
             self._print_final_stats(len(self.all_urls))
+            self._print_crawl_stats()
 
             return self.results
 
@@ -106,16 +79,64 @@ class YandexParser(BaseParser):
         finally:
             await self.close()
 
+    async def _collect_all_zones(self, planner: ZonePlanner):
+        """Этап 1: сбор ссылок на парковки по всем областям города"""
+        for i, area in enumerate(planner, 1):
+            if self._is_zone_done(area):
+                print(f"\n⏭ Зона {i} (+{planner.pending()}): {area['name']} уже пройдена")
+                continue
+
+            urls_before = len(self.all_urls)
+
+            print(f"\n📍 Зона {i} (+{planner.pending()} в очереди): {area['name']}")
+            print(f"   Координаты: {area['coords'][1]:.4f}°N, {area['coords'][0]:.4f}°E")
+            print(f"   URL: {area['url']}")
+
+            self._start_zone()
+            try:
+                async with self.browser_manager.use():
+                    await self._with_timeout(self._collect_zone_urls(area), 'zone')
+            except asyncio.TimeoutError:
+                self._abandon_zone(area)
+                continue
+
+            new_urls = len(self.all_urls) - urls_before
+            found = self._finish_zone(planner, area, new_urls)
+            print(f"✅ В области найдено парковок: {found} (новых: {new_urls})")
+            print(f"\n✅ Всего собрано ссылок на парковки: {len(self.all_urls)}")
+
+        planner.print_stats()
+
+    async def _collect_zone_urls(self, area: Dict[str, Any]):
+        """Открытие области и сбор ссылок из ее выдачи"""
+        page = await self._open_url(area['url'])
+        await self._prepare_tab(page)
+        await self._attach_search_collector(page)
+        await self._wait_for_ready(page, self._ready_selectors('zone'), kind='zone')
+
+        # Кликаем кнопку "Показать результаты", если есть
+        button = await self._with_timeout(page.query_selector('span.search-command-view__show-results-button'), 'evaluate')
+        if button:
+            print("✅ Кнопка найдена, кликаем...")
+            await self._with_timeout(button.click(), 'evaluate')
+            await self._wait_for_ready(page, self._ready_selectors('results'), kind='results')
+            print("✅ Результаты загружены")
+
+        # Скрапим эту область
+        await self._scroll_and_collect_urls(page)
+
+    def _build_zone_url(self, lon: float, lat: float, zoom: int) -> str:
+        """URL поиска парковок с центром карты в точке"""
+        return (f"https://yandex.ru/maps/2/saint-petersburg/search/парковки/"
+                f"?l=carparks&ll={lon:.6f}%2C{lat:.6f}&z={zoom}")
+
     def generate_grid_z14(self) -> List[Dict[str, str]]:
         """
         Автоматически генерирует сетку зон для парсинга (z=14).
         Возвращает список URL для поиска, покрывающих весь Санкт-Петербург.
         """
-        # 1. Определяем географические границы Санкт-Петербурга
-        # (широта lat, долгота lon)
-        # Эти значения можно немного расширить для полного охвата
-        LAT_MIN, LAT_MAX = 59.90, 60.05  # Север-Юг
-        LON_MIN, LON_MAX = 30.20, 30.70  # Запад-Восток
+        # 1. Географические границы Санкт-Петербурга (широта lat, долгота lon)
+        LAT_MIN, LAT_MAX, LON_MIN, LON_MAX = self.city_bbox
 
         # 2. Рассчитываем шаг сетки для z=14
         # При z=14 sspn ~0.04-0.05 градуса, делаем шаг немного меньше для перекрытия
@@ -131,13 +152,9 @@ class YandexParser(BaseParser):
         while lat < LAT_MAX:
             lon = LON_MIN
             while lon < LON_MAX:
-                # Формируем URL для поиска парковок в этой зоне
-                url = (f"https://yandex.ru/maps/2/saint-petersburg/search/парковки/"
-                       f"?l=carparks&ll={lon:.6f}%2C{lat:.6f}&z=14")
-
                 zones.append({
                     "name": f"Автозона {zone_counter}",
-                    "url": url,
+                    "url": self._build_zone_url(lon, lat, 14),
                     "coords": (lon, lat)  # Для отладки
                 })
 
@@ -157,20 +174,25 @@ class YandexParser(BaseParser):
         no_new_count = 0
         previous_count = len(self.all_urls)
 
+        # Первая выдача области может прийти в HTML, а не отдельным запросом поиска
+        await self._harvest_links(page)
+        if self.search_collector:
+            await self._collect_search_results()
+        responses_before = self._search_responses_seen()
+
         for scroll_num in range(1, max_scrolls + 1):
             print(f"   📍 Скролл {scroll_num}/{max_scrolls}")
 
-            # Сохраняем текущее количество
-            current_count_before = len(self.all_urls)
-
             # Выполняем скроллинг для Яндекс
             await self._yandex_specific_scroll(page)
             await asyncio.sleep(random.uniform(1.5, 2.5))
 
-            # Собираем ссылки
-            html_content = await page.evaluate("document.documentElement.outerHTML")
+            # Собираем ссылки: из JSON-ответов поиска, если они приходят, иначе из DOM
             urls_before = len(self.all_urls)
-            self._extract_urls_from_html(html_content)
+            if self._search_responses_seen() > responses_before:
+                await self._collect_search_results()
+            else:
+                await self._harvest_links(page)
             new_urls = len(self.all_urls) - urls_before
 
             if new_urls > 0:
@@ -198,7 +220,7 @@ class YandexParser(BaseParser):
     async def _yandex_specific_scroll(self, page):
         """Специфичный скроллинг для Яндекс.Карт"""
         try:
-            await page.evaluate("""
+            await self._with_timeout(page.evaluate("""
                 (function() {
                     const selectors = [
                         '.scroll__container_width_narrow',
@@ -225,7 +247,7 @@ class YandexParser(BaseParser):
 
                     return { containerScrolled: scrolled };
                 })();
-            """)
+            """), 'evaluate')
         except Exception as e:
             print(f"   ⚠ Ошибка скроллинга: {e}")
 
@@ -261,82 +283,152 @@ class YandexParser(BaseParser):
 
         return url
 
+    def _result_link_pattern(self) -> str:
+        """href карточек выдачи Яндекс Карт"""
+        return Config.YANDEX['result_link_pattern']
+
+    def _search_api_patterns(self) -> List[str]:
+        """URL поисковых XHR Яндекс Карт"""
+        return Config.YANDEX['search_api_patterns']
+
+    def _parse_search_payload(self, payload: Any) -> List[Dict[str, Any]]:
+        """Разбор JSON ответа поиска Яндекс Карт"""
+        data = payload.get('data', payload) if isinstance(payload, dict) else {}
+        raw_items = data.get('items') if isinstance(data, dict) else None
+
+        items = []
+        for item in raw_items or []:
+            if not isinstance(item, dict):
+                continue
+
+            # В выдаче бывают топонимы - берем только организации с числовым ID
+            org_id = str(item.get('id') or '')
+            if not org_id.isdigit():
+                continue
+
+            seoname = item.get('seoname')
+            path = f"/maps/org/{seoname}/{org_id}/" if seoname else f"/maps/org/{org_id}/"
+
+            # Яндекс: долгота,широта -> меняем на широта,долгота
+            coordinates = item.get('coordinates') or []
+            coords = f"{coordinates[1]},{coordinates[0]}" if len(coordinates) == 2 else ''
+
+            items.append({
+                'url': self._normalize_url(path),
+                'id': org_id,
+                'name': item.get('title', ''),
+                'address': item.get('fullAddress') or item.get('address', ''),
+                'coords': coords
+            })
+
+        return items
+
+    async def _harvest_links(self, page):
+        """Сбор новых ссылок выдачи: прирост от наблюдателя DOM или разбор всего HTML"""
+        links = await self._with_timeout(self.link_harvester.poll(page), 'evaluate') if self.link_harvester else None
+        if links is None:
+            html_content = await self._with_timeout(page.evaluate("document.documentElement.outerHTML"), 'content')
+            self._extract_urls_from_html(html_content)
+            return
+
+        new_urls = self._add_org_links(links)
+        if new_urls > 0:
+            print(f"   📥 Извлечено {new_urls} новых URL")
+
+    def _add_org_links(self, links: List[str]) -> int:
+        """Нормализация ссылок на организации и регистрация новых"""
+        clean_urls = []
+        for link in links:
+            clean_url = self._normalize_url(link)
+            # Фильтруем системные ссылки
+            if clean_url and not any(exclude in clean_url.lower() for exclude in ['/reviews/', '/photos/', '/gallery/', '/menu/']):
+                clean_urls.append(clean_url)
+        return self._add_urls(clean_urls)
+
     def _extract_urls_from_html(self, html_content: str):
         """Извлечение ссылок на парковки из HTML"""
         try:
-            urls_before = len(self.all_urls)
-
-            # Ищем ссылки на организации
+            # Ищем ссылки на организации (ссылки карточек выдачи входят в их число)
             org_pattern = r'href="(/maps/org/[^"]+)"'
-            all_link_matches = re.findall(org_pattern, html_content)
-
-            for link in all_link_matches:
-                full_url = f"https://yandex.ru{link}"
-                clean_url = self._normalize_url(full_url)
-                if clean_url:
-                    # Фильтруем системные ссылки
-                    if not any(exclude in clean_url.lower() for exclude in ['/reviews/', '/photos/', '/gallery/', '/menu/']):
-                        self.all_urls.add(clean_url)
-
-            # Ищем в карточках
-            snippet_pattern = r'<li[^>]*class="[^"]*search-snippet-view[^"]*"[^>]*>.*?</li>'
-            snippets = re.findall(snippet_pattern, html_content, re.DOTALL)
-
-            for snippet in snippets:
-                link_match = re.search(org_pattern, snippet)
-                if link_match:
-                    link = link_match.group(1)
-                    full_url = f"https://yandex.ru{link}"
-                    clean_url = self._normalize_url(full_url)
-                    if clean_url and not any(exclude in clean_url.lower() for exclude in ['/reviews/', '/photos/', '/gallery/', '/menu/']):
-                        self.all_urls.add(clean_url)
+            new_urls = self._add_org_links(re.findall(org_pattern, html_content))
 
-            new_urls = len(self.all_urls) - urls_before
             if new_urls > 0:
                 print(f"   📥 Извлечено {new_urls} новых URL")
 
         except Exception as e:
             print(f"❌ Ошибка извлечения URL: {e}")
 
-    async def parse_parking_page(self, url: str) -> Dict[str, Any]:
-        """Парсинг страницы парковки"""
-        try:
-            print(f"      📖 Открываем страницу парковки...")
-            page = await self.browser.get(url)
-            await asyncio.sleep(random.uniform(3, 4))
-
-            # Получаем HTML
-            html_content = await page.evaluate("document.documentElement.outerHTML")
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # Парсим данные
-            data = self._extract_page_data(url, soup, html_content)
-
-            # Проверяем, что парковка в Санкт-Петербурге
-            address = data.get('Адрес', '')
-            if address:
-                address_lower = address.lower()
-                spb_patterns = [
-                    'санкт-петербург',
-                    'спб',
-                    'г.санкт-петербург',
-                    'г. спб',
-                    'ленинград',
-                    'г.ленинград'
-                ]
-
-                is_spb = any(pattern in address_lower for pattern in spb_patterns)
-                if not is_spb:
-                    print(f"      🚫 Пропускаем парковку (не из Санкт-Петербурга): {address}")
-                    return None
-
-            return data if data else None
+    async def _parse_detail_page(self, url: str, tab) -> Optional[Dict[str, Any]]:
+        """Парсинг страницы парковки во вкладке воркера"""
+        return await self.parse_parking_page(url, tab)
 
+    async def parse_parking_page(self, url: str, tab=None) -> Dict[str, Any]:
+        """Парсинг страницы парковки (в переданной вкладке или основной)"""
+        from_network = False
+        try:
+            html_content = self._get_cached_html(url)
+            if html_content is not None:
+                print(f"      📦 Страница парковки из кэша HTML")
+            else:
+                print(f"      📖 Открываем страницу парковки...")
+                from_network = True
+                page = await self._open_url(url, tab)
+                await self._wait_for_ready(page, self._ready_selectors('detail'))
+
+                # Получаем HTML
+                html_content = await self._with_timeout(page.evaluate("document.documentElement.outerHTML"), 'content')
+                self._store_html(url, html_content)
+
+            record = self._build_parking_record(url, html_content)
+            if from_network:
+                # Без названия страница, скорее всего, не догрузилась
+                empty = record is not None and not record.get('Название объекта')
+                self._record_outcome(url, crawl_tuner.EMPTY if empty else crawl_tuner.SUCCESS)
+            return record
+
+        except asyncio.TimeoutError:
+            # Зависшую вкладку восстанавливает воркер
+            raise
         except Exception as e:
             print(f"      ❌ Ошибка парсинга: {e}")
+            if from_network:
+                self._record_outcome(url, crawl_tuner.FAIL)
             return None
 
-    def _extract_page_data(self, url: str, soup: BeautifulSoup, html: str) -> Dict[str, Any]:
+    def _record_from_html(self, url: str, html: str, preview_coords: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Итоговая запись парковки из HTML страницы (без браузера, например из кэша)"""
+        return self._build_parking_record(url, html, preview_coords)
+
+    def _build_parking_record(self, url: str, html_content: str,
+                              preview_coords: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Извлечение данных парковки из HTML с проверкой, что она в Санкт-Петербурге"""
+        page = PageContext(html_content, 'html.parser')
+
+        # Парсим данные
+        data = self._extract_page_data(url, page)
+        self._apply_preview_coords(url, data, preview_coords)
+
+        # Проверяем, что парковка в Санкт-Петербурге
+        address = data.get('Адрес', '')
+        if address:
+            address_lower = address.lower()
+            spb_patterns = [
+                'санкт-петербург',
+                'спб',
+                'г.санкт-петербург',
+                'г. спб',
+                'ленинград',
+                'г.ленинград'
+            ]
+
+            is_spb = any(pattern in address_lower for pattern in spb_patterns)
+            if not is_spb:
+                print(f"      🚫 Пропускаем парковку (не из Санкт-Петербурга): {address}")
+                return None
+
+        return data if data else None
+
+    def _extract_page_data(self, url: str, page: PageContext) -> Dict[str, Any]:
         """Извлечение данных со страницы парковки (специфично для Яндекс)"""
         data = {
             'source': 'yandex',
@@ -345,140 +437,29 @@ class YandexParser(BaseParser):
             'Ссылка на парковку': url
         }
 
-        # 1. Название
-        title_selectors = [
-            'h1',
-            '.orgpage-header-view__header',
-            '.business-title',
-            '.card-title-view__title',
-            '[itemprop="name"]'
-        ]
-
-        for selector in title_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = self._clean_text(elem.get_text())
-                if text:
-                    data['Название объекта'] = text
-                    data['Название парковки'] = text
-                    break
-
-        # 2. Адрес
-        address_selectors = [
-            '[itemprop="address"]',
-            '.business-contacts-view__address',
-            '.card-address-view__address',
-            '.orgpage-address-view__address-text',
-            'address'
-        ]
-
-        for selector in address_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = self._clean_text(elem.get_text())
-                if text:
-                    data['Адрес'] = text
-                    data['Адрес парковки'] = text
-                    break
+        # Название, адрес, сайт, тип, время работы, рейтинг, отзывы, описание (Config.YANDEX['fields'])
+        FIELDS.extract(page, data)
 
-        # 3. Координаты
-        coords = self._extract_yandex_coordinates(url, soup)
+        # Координаты
+        coords = self._extract_yandex_coordinates(url, page.soup)
         if coords:
             data['Координаты'] = coords
 
-        # 4. Телефон
+        # Телефон
         phones = []
-        phone_links = soup.find_all('a', href=re.compile(r'^tel:'))
+        phone_links = page.select('a[href^="tel:"]')
         for link in phone_links:
             phone = link.get('href', '').replace('tel:', '').strip()
             if phone:
-                clean_phone = re.sub(r'[^\d+]', '', phone)
+                clean_phone = PHONE_CHARS.sub('', phone)
                 if clean_phone and clean_phone not in phones:
                     phones.append(clean_phone)
 
         if phones:
             data['Телефон'] = ', '.join(phones)
 
-        # 5. Сайт
-        site_selectors = [
-            '.business-urls-view__link',
-            '.card-website-view__link',
-            '.orgpage-url-view__url'
-        ]
-
-        for selector in site_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                href = elem.get('href', '')
-                if href and 'yandex.ru' not in href:
-                    data['Сайт'] = href
-                    break
-
-        # 6. Тип объекта
-        category_selectors = [
-            '.business-categories-view__category',
-            '.card-categories-view__category',
-            '.orgpage-categories-view__category',
-            '[itemprop="category"]'
-        ]
-
-        for selector in category_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = self._clean_text(elem.get_text())
-                if text:
-                    data['Тип объекта'] = text
-                    break
-
-        # 7. Время работы
-        hours_selectors = [
-            '.business-feature-view__schedule-days',
-            '.card-schedule-view__schedule',
-            '.orgpage-working-view__working-days',
-            '[itemprop="openingHours"]'
-        ]
-
-        for selector in hours_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = self._clean_text(elem.get_text())
-                if text and (':' in text or 'час' in text.lower()):
-                    data['Время работы'] = text
-                    break
-
-        # 8. Рейтинг и оценки
-        rating_selectors = [
-            '.business-rating-badge-view__rating-text',
-            '.card-rating-view__rating',
-            '.orgpage-rating-view__rating',
-            '[itemprop="ratingValue"]'
-        ]
-
-        for selector in rating_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = self._clean_text(elem.get_text())
-                if text:
-                    data['Оценка'] = text
-                    break
-
-        reviews_selectors = [
-            '.business-rating-badge-view__rating-count',
-            '.card-rating-view__reviews-count',
-            '.orgpage-reviews-view__reviews-count',
-            '[itemprop="reviewCount"]'
-        ]
-
-        for selector in reviews_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = self._clean_text(elem.get_text())
-                if text:
-                    data['Количество оценок'] = text
-                    break
-
-        # 9. Тип парковки
-        parking_type = self._detect_yandex_parking_type(soup, data.get('Название объекта', ''), html)
+        # Тип парковки
+        parking_type = self._detect_yandex_parking_type(page, data.get('Название объекта', ''))
         data['Тип парковки'] = parking_type
 
         # Определяем доступ
@@ -487,35 +468,18 @@ class YandexParser(BaseParser):
         else:
             data['Доступ'] = 'Открытый'
 
-        # 10. Цены
-        page_text = soup.get_text()
-        price_matches = re.findall(r'(\d+\s*руб|\d+\s*₽|\d+\s*в час|\d+\s*в сутки)', page_text, re.IGNORECASE)
+        # Цены
+        price_matches = PRICE_PATTERN.findall(page.raw_text)
         if price_matches:
             data['Цены'] = price_matches[0]
             data['Тарифы'] = '; '.join(price_matches[:3])
 
-        # 11. Вместимость
-        capacity_match = re.search(r'(\d+)\s*мест|\bвместимость\s*(\d+)', page_text, re.IGNORECASE)
+        # Вместимость
+        capacity_match = CAPACITY_PATTERN.search(page.raw_text)
         if capacity_match:
             capacity = capacity_match.group(1) or capacity_match.group(2)
             data['Вместимость'] = capacity
 
-        # 12. Описание
-        desc_selectors = [
-            '.business-description-view__description',
-            '.card-description-view__description',
-            '.orgpage-description-view__description',
-            '[itemprop="description"]'
-        ]
-
-        for selector in desc_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = self._clean_text(elem.get_text())
-                if text:
-                    data['Описание'] = text[:500]
-                    break
-
         return data
 
     def _extract_yandex_coordinates(self, url: str, soup: BeautifulSoup) -> Optional[str]:
@@ -546,9 +510,9 @@ class YandexParser(BaseParser):
 
         return None
 
-    def _detect_yandex_parking_type(self, soup: BeautifulSoup, name: str, html: str) -> str:
+    def _detect_yandex_parking_type(self, page: PageContext, name: str) -> str:
         """Определение типа парковки для Яндекс"""
-        text = (name + ' ' + soup.get_text()).lower()
+        text = name.lower() + ' ' + page.raw_text_lower
         type_info = []
 
         # Проверка платности
@@ -572,6 +536,14 @@ class YandexParser(BaseParser):
 
         return ", ".join(type_info) if type_info else "неизвестно"
 
+    def _generate_parking_id(self, url: str) -> str:
+        """Генерация уникального ID парковки по ID организации в URL"""
+        match = re.search(r'/org/(?:[^/]+/)?(\d+)', url)
+        if match:
+            return f"yandex_{match.group(1)}"
+
+        return super()._generate_parking_id(url)
+
     def _remove_duplicates(self):
         """Удаление дубликатов по уникальному ID"""
         if not self.results:
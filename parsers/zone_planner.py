@@ -0,0 +1,212 @@
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterator
+
+# Размер ячейки (широта, долгота) при z=14, как у фиксированной сетки
+BASE_ZOOM = 14
+BASE_STEP = (0.04, 0.06)
+
+
+class ZonePlanner:
+    """
+    Адаптивное разбиение города на зоны поиска (квадродерево).
+
+    Обход начинается с крупных ячеек. Ячейка, выдача которой выглядит обрезанной
+    (не меньше saturation объектов), делится на 4 ячейки следующего масштаба.
+    Пустые ячейки отбрасываются. Выученное разбиение сохраняется в state_path
+    и используется в следующем прогоне.
+    """
+
+    def __init__(self, bbox: Tuple[float, float, float, float], build_url: Callable[[float, float, int], str],
+                 start_zoom: int = 12, max_zoom: int = 16, saturation: int = 100,
+                 state_path: Optional[str] = None, empty_ttl_days: float = 30,
+                 shard: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            bbox: Границы (lat_min, lat_max, lon_min, lon_max)
+            build_url: Функция построения URL поиска по (lon, lat, zoom) центра ячейки
+            start_zoom: Масштаб начальной сетки
+            max_zoom: Максимальный масштаб при делении
+            saturation: Число объектов в выдаче, при котором ячейка делится
+            state_path: Файл выученного разбиения (None - не сохранять)
+            empty_ttl_days: Через сколько дней перепроверять пустые ячейки
+            shard: (номер с 0, всего) - взять только свою долю начальных ячеек;
+                выученное разбиение шарда хранится в его собственном state_path
+        """
+        self.bbox = bbox
+        self.build_url = build_url
+        self.start_zoom = start_zoom
+        self.max_zoom = max_zoom
+        self.saturation = saturation
+        self.state_path = Path(state_path) if state_path else None
+        self.empty_ttl_days = empty_ttl_days
+
+        self.cells: Dict[str, Dict[str, Any]] = {}
+        self._queue: deque = deque()
+        self.visited = 0
+        self.split = 0
+        self.dropped = 0
+
+        if not self._load_state():
+            cells = self._initial_grid()
+            if shard:
+                index, count = shard
+                cells = cells[index::count]
+            for cell in cells:
+                self._add_cell(cell)
+
+    @classmethod
+    def fixed(cls, zones: List[Dict[str, Any]]) -> 'ZonePlanner':
+        """Неадаптивный план из готового списка зон (без деления и сохранения)"""
+        planner = cls.__new__(cls)
+        planner.state_path = None
+        planner.max_zoom = 0
+        planner.saturation = float('inf')
+        planner.cells = {}
+        planner._queue = deque(zones)
+        planner.visited = planner.split = planner.dropped = 0
+        return planner
+
+    # === ПОСТРОЕНИЕ ЯЧЕЕК ===
+
+    def _cell_step(self, zoom: int) -> Tuple[float, float]:
+        """Размер ячейки (широта, долгота) для масштаба"""
+        factor = 2 ** (BASE_ZOOM - zoom)
+        return BASE_STEP[0] * factor, BASE_STEP[1] * factor
+
+    def _make_cell(self, lat_min: float, lon_min: float, zoom: int) -> Dict[str, Any]:
+        """Описание ячейки"""
+        return {
+            'key': f"{zoom}:{lat_min:.5f}:{lon_min:.5f}",
+            'lat_min': lat_min,
+            'lon_min': lon_min,
+            'zoom': zoom,
+            'status': 'pending',
+            'found': None,
+            'visited_at': None,
+        }
+
+    def _initial_grid(self) -> List[Dict[str, Any]]:
+        """Крупная начальная сетка над границами города"""
+        lat_min, lat_max, lon_min, lon_max = self.bbox
+        lat_step, lon_step = self._cell_step(self.start_zoom)
+
+        cells = []
+        lat = lat_min
+        while lat < lat_max:
+            lon = lon_min
+            while lon < lon_max:
+                cells.append(self._make_cell(lat, lon, self.start_zoom))
+                lon += lon_step
+            lat += lat_step
+        return cells
+
+    def _add_cell(self, cell: Dict[str, Any]):
+        """Добавление ячейки в план и очередь обхода"""
+        self.cells[cell['key']] = cell
+        self._queue.append(self._to_zone(cell))
+
+    def _to_zone(self, cell: Dict[str, Any]) -> Dict[str, Any]:
+        """Зона для парсера из ячейки"""
+        lat_step, lon_step = self._cell_step(cell['zoom'])
+        lon = cell['lon_min'] + lon_step / 2
+        lat = cell['lat_min'] + lat_step / 2
+        return {
+            'name': f"Ячейка z{cell['zoom']} ({lat:.4f}, {lon:.4f})",
+            'url': self.build_url(lon, lat, cell['zoom']),
+            'coords': (lon, lat),
+            'zoom': cell['zoom'],
+            'key': cell['key'],
+        }
+
+    # === ОБХОД ===
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Зоны для обхода; очередь пополняется при делении ячеек"""
+        while self._queue:
+            yield self._queue.popleft()
+
+    def pending(self) -> int:
+        """Зон в очереди"""
+        return len(self._queue)
+
+    def report(self, zone: Dict[str, Any], found: int):
+        """
+        Учет результата зоны
+
+        Args:
+            zone: Пройденная зона
+            found: Сколько объектов было в выдаче зоны (включая уже известные)
+        """
+        self.visited += 1
+        cell = self.cells.get(zone.get('key'))
+        if cell is None:
+            return
+
+        cell['found'] = found
+        cell['visited_at'] = time.time()
+
+        if found >= self.saturation and cell['zoom'] < self.max_zoom:
+            # Выдача обрезана - делим ячейку на 4
+            cell['status'] = 'split'
+            self.split += 1
+            lat_step, lon_step = self._cell_step(cell['zoom'] + 1)
+            for d_lat in (0, lat_step):
+                for d_lon in (0, lon_step):
+                    child = self._make_cell(cell['lat_min'] + d_lat, cell['lon_min'] + d_lon, cell['zoom'] + 1)
+                    if child['key'] not in self.cells:
+                        self._add_cell(child)
+        elif found == 0:
+            cell['status'] = 'empty'
+            self.dropped += 1
+        else:
+            cell['status'] = 'leaf'
+
+        self._save_state()
+
+    # === СОХРАНЕНИЕ РАЗБИЕНИЯ ===
+
+    def _load_state(self) -> bool:
+        """Загрузка выученного разбиения; False, если его нет"""
+        if not self.state_path or not self.state_path.exists():
+            return False
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                cells = json.load(f)['cells']
+        except Exception as e:
+            print(f"⚠ Не удалось загрузить разбиение зон {self.state_path}: {e}")
+            return False
+
+        recheck_before = time.time() - self.empty_ttl_days * 86400
+        skipped = 0
+        for cell in cells:
+            self.cells[cell['key']] = cell
+            if cell['status'] == 'split':
+                continue
+            if cell['status'] == 'empty' and (cell.get('visited_at') or 0) >= recheck_before:
+                skipped += 1
+                continue
+            self._queue.append(self._to_zone(cell))
+
+        print(f"🧩 Разбиение зон из {self.state_path}: {len(self._queue)} зон, "
+              f"пустых пропущено: {skipped}")
+        return bool(self._queue)
+
+    def _save_state(self):
+        """Атомарное сохранение разбиения"""
+        if not self.state_path:
+            return
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'cells': list(self.cells.values())}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def print_stats(self):
+        """Вывод статистики обхода зон"""
+        print(f"\n🧩 ЗОНЫ: пройдено {self.visited}, разделено {self.split}, пустых отброшено {self.dropped}")
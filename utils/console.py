@@ -0,0 +1,44 @@
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Префикс строк вывода текущей задачи (например, "[Яндекс] ")
+output_prefix: ContextVar[str] = ContextVar('output_prefix', default='')
+
+
+class PrefixedStream:
+    """Поток вывода, добавляющий к каждой строке префикс задачи, которая ее печатает"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._line_start = True
+
+    def write(self, text: str) -> int:
+        prefix = output_prefix.get()
+        if prefix:
+            pieces = []
+            for line in text.splitlines(keepends=True):
+                if self._line_start:
+                    pieces.append(prefix)
+                pieces.append(line)
+                self._line_start = line.endswith('\n')
+            self._stream.write(''.join(pieces))
+        else:
+            self._stream.write(text)
+            if text:
+                self._line_start = text.endswith('\n')
+        return len(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+@contextmanager
+def prefixed_output():
+    """Включение префиксов задач для stdout на время блока"""
+    original = sys.stdout
+    sys.stdout = PrefixedStream(original)
+    try:
+        yield
+    finally:
+        sys.stdout = original